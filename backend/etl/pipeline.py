@@ -8,13 +8,18 @@ import logging
 import shutil
 from pathlib import Path
 from typing import List, Dict, Tuple, Optional
-from uuid import UUID, uuid4
+from uuid import uuid4
 from datetime import datetime
 from decimal import Decimal
 
 # Import psycopg3 (modern PostgreSQL adapter)
 import psycopg
-from psycopg.types.json import Json
+from psycopg.types.json import Json, set_json_dumps
+
+try:
+    import orjson  # Optional: faster serialization for JSONB columns
+except ImportError:
+    orjson = None
 
 from backend.models import (
     RawAdvocateUser,
@@ -27,6 +32,21 @@ from backend.models import (
 logger = logging.getLogger(__name__)
 
 
+def _json_dumps(obj):
+    """
+    Serialize a Json(...) value with orjson, falling back to json.dumps
+    
+    orjson is stricter than the stdlib: it rejects ints wider than 64 bits
+    and (without OPT_NON_STR_KEYS) non-str dict keys. Values such as the
+    raw record stored with a data quality issue can hold anything, so one
+    of them must not abort the whole COPY.
+    """
+    try:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+    except (TypeError, orjson.JSONEncodeError):
+        return json.dumps(obj)
+
+
 class AdvocacyETL:
     """
     ETL pipeline for advocacy platform data
@@ -106,6 +126,10 @@ class AdvocacyETL:
             if 'database' in config:
                 config['dbname'] = config.pop('database')
             self.conn = psycopg.connect(**config)
+            if orjson is not None:
+                # Serialize Json(...) metadata with orjson on this connection;
+                # psycopg accepts the bytes it returns as-is
+                set_json_dumps(_json_dumps, context=self.conn)
             logger.info("✅ Database connection established")
         except Exception as e:
             logger.error(f"❌ Failed to connect to database: {e}")
@@ -353,7 +377,7 @@ class AdvocacyETL:
                 
                 # Create clean advocate user (without email, linked to account)
                 clean_user = CleanAdvocateUser(
-                    user_id=UUID(raw_user.user_id) if raw_user.user_id else uuid4(),
+                    user_id=raw_user.user_id or uuid4(),
                     account_id=advocate_account.account_id,
                     name=raw_user.name,
                     instagram_handle=raw_user.instagram_handle,
@@ -405,7 +429,7 @@ class AdvocacyETL:
                         )
                     
                     clean_program = CleanProgram(
-                        program_id=UUID(raw_program.program_id) if raw_program.program_id else uuid4(),
+                        program_id=raw_program.program_id or uuid4(),
                         user_id=clean_user.user_id,
                         brand=program_brand  # Use fallback if needed
                     )
@@ -445,7 +469,7 @@ class AdvocacyETL:
                             )
                         
                         clean_task = CleanTask(
-                            task_id=UUID(raw_task.task_id) if raw_task.task_id else uuid4(),
+                            task_id=raw_task.task_id or uuid4(),
                             program_id=clean_program.program_id,
                             platform=task_platform,
                             post_url=raw_task.post_url,
@@ -597,93 +621,53 @@ class AdvocacyETL:
                     processed_emails.add(advocate_account.email)
             
             # ================================================================
-            # STEP 2: Insert Advocate Users
+            # STEP 2: Collect Rows Per Table
             # ================================================================
-            # Now that accounts exist in database, we can insert users that
-            # reference them via account_id foreign key.
+            # Walk the hierarchical clean data once and flatten it into one
+            # row list per table, so each table can be sent as a single batch
+            # instead of one round-trip per record:
+            #
+            #   clean_user
+            #     └─ program_data (list)
+            #          └─ (clean_program, task_data, clean_sales)
+            #               └─ task_data (list)
+            #                    └─ (clean_task, clean_analytics)
             #
-            # Critical: We must use the ACTUAL account_id from the database
+            # Critical: users must use the ACTUAL account_id from the database
             # (retrieved in Step 1), not our generated account_id, because:
             # - Account might already exist with different ID
             # - Multiple users share the same account (same email)
             # - Foreign key constraint requires valid account_id
             
+            user_rows = []
+            program_rows = []
+            sales_rows = []
+            task_rows = []
+            analytics_rows = []
+            
             for clean_user, program_data, advocate_account in clean_data:
-                # Look up the actual database account_id for this user's email
-                actual_account_id = email_to_account_id[advocate_account.email]
-                
-                # Insert or update user
-                # ON CONFLICT handles re-imports and updates existing users
-                cursor.execute("""
-                    INSERT INTO advocate_users (
-                        user_id, account_id, name, instagram_handle, 
-                        tiktok_handle, joined_at, metadata
-                    ) VALUES (%s, %s, %s, %s, %s, %s, %s)
-                    ON CONFLICT (user_id) DO UPDATE SET
-                        account_id = EXCLUDED.account_id,
-                        name = EXCLUDED.name,
-                        instagram_handle = EXCLUDED.instagram_handle,
-                        tiktok_handle = EXCLUDED.tiktok_handle,
-                        joined_at = EXCLUDED.joined_at,
-                        updated_at = NOW()
-                """, (
+                user_rows.append((
                     clean_user.user_id,
-                    actual_account_id,  # CRITICAL: Use actual DB account_id, not generated
+                    email_to_account_id[advocate_account.email],  # CRITICAL: Use actual DB account_id
                     clean_user.name,
                     clean_user.instagram_handle,
                     clean_user.tiktok_handle,
                     clean_user.joined_at,
                     Json(clean_user.metadata)
                 ))
-                self.stats['users_created'] += 1
-                
-                # ============================================================
-                # STEP 3: Insert Programs, Sales, Tasks, and Analytics
-                # ============================================================
-                # Now process the hierarchical data for this user:
-                # user → programs → sales + tasks → analytics
-                #
-                # Nesting structure:
-                #   clean_user
-                #     └─ program_data (list)
-                #          └─ (clean_program, task_data, clean_sales)
-                #               └─ task_data (list)
-                #                    └─ (clean_task, clean_analytics)
                 
                 for clean_program, task_data, clean_sales in program_data:
-                    # --------------------------------------------------------
-                    # Insert Program
-                    # --------------------------------------------------------
-                    cursor.execute("""
-                        INSERT INTO programs (
-                            program_id, user_id, brand, program_data, started_at
-                        ) VALUES (%s, %s, %s, %s, %s)
-                        ON CONFLICT (program_id) DO UPDATE SET
-                            brand = EXCLUDED.brand,
-                            updated_at = NOW()
-                    """, (
+                    program_rows.append((
                         clean_program.program_id,
                         clean_program.user_id,
                         clean_program.brand,
                         Json(clean_program.program_data),
                         clean_program.started_at
                     ))
-                    self.stats['programs_created'] += 1
                     
-                    # --------------------------------------------------------
-                    # Insert Sales Attribution (if present)
-                    # --------------------------------------------------------
                     # Not all programs have sales - many are awareness-focused
-                    # Sales is inserted after program because of FK dependency
                     if clean_sales:
-                        cursor.execute("""
-                            INSERT INTO sales_attribution (
-                                attribution_id, program_id, amount, currency, 
-                                attributed_at, attribution_data
-                            ) VALUES (%s, %s, %s, %s, %s, %s)
-                            ON CONFLICT (attribution_id) DO UPDATE SET
-                                amount = EXCLUDED.amount
-                        """, (
+                        sales_rows.append((
                             clean_sales.attribution_id,
                             clean_sales.program_id,
                             clean_sales.amount,
@@ -691,26 +675,9 @@ class AdvocacyETL:
                             clean_sales.attributed_at,
                             Json(clean_sales.attribution_data)
                         ))
-                        self.stats['sales_created'] += 1
                     
-                    # --------------------------------------------------------
-                    # Insert Tasks and Analytics
-                    # --------------------------------------------------------
-                    # Tasks are the atomic work units (social media posts)
-                    # Analytics are time-series metrics for each task
                     for clean_task, clean_analytics in task_data:
-                        # Insert task
-                        cursor.execute("""
-                            INSERT INTO tasks (
-                                task_id, program_id, platform, post_url, 
-                                posted_at, platform_data
-                            ) VALUES (%s, %s, %s, %s, %s, %s)
-                            ON CONFLICT (task_id) DO UPDATE SET
-                                platform = EXCLUDED.platform,
-                                post_url = EXCLUDED.post_url,
-                                posted_at = EXCLUDED.posted_at,
-                                updated_at = NOW()
-                        """, (
+                        task_rows.append((
                             clean_task.task_id,
                             clean_task.program_id,
                             clean_task.platform,
@@ -718,23 +685,11 @@ class AdvocacyETL:
                             clean_task.posted_at,
                             Json(clean_task.platform_data)
                         ))
-                        self.stats['tasks_created'] += 1
                         
-                        # Insert analytics if present (not all tasks have analytics yet)
-                        # New posts don't have metrics until they accumulate engagement
+                        # Not all tasks have analytics yet - new posts don't
+                        # have metrics until they accumulate engagement
                         if clean_analytics:
-                            cursor.execute("""
-                                INSERT INTO social_analytics (
-                                    analytics_id, task_id, likes, comments, 
-                                    shares, reach, additional_metrics, measured_at
-                                ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
-                                ON CONFLICT (task_id, measured_at) DO UPDATE SET
-                                    likes = EXCLUDED.likes,
-                                    comments = EXCLUDED.comments,
-                                    shares = EXCLUDED.shares,
-                                    reach = EXCLUDED.reach,
-                                    updated_at = NOW()
-                            """, (
+                            analytics_rows.append((
                                 clean_analytics.analytics_id,
                                 clean_analytics.task_id,
                                 clean_analytics.likes,
@@ -744,30 +699,108 @@ class AdvocacyETL:
                                 Json(clean_analytics.additional_metrics),
                                 clean_analytics.measured_at
                             ))
-                            self.stats['analytics_created'] += 1
+            
+            # ================================================================
+            # STEP 3: Batch Upsert Users, Programs, Sales, Tasks, Analytics
+            # ================================================================
+            # executemany() runs in psycopg's pipeline mode, so each table is
+            # sent without waiting for a round-trip per row. Tables are
+            # written in foreign key order (users → programs → sales/tasks →
+            # analytics). COPY can't be used here because re-imports rely on
+            # ON CONFLICT upserts.
+            if user_rows:
+                cursor.executemany("""
+                    INSERT INTO advocate_users (
+                        user_id, account_id, name, instagram_handle, 
+                        tiktok_handle, joined_at, metadata
+                    ) VALUES (%s, %s, %s, %s, %s, %s, %s)
+                    ON CONFLICT (user_id) DO UPDATE SET
+                        account_id = EXCLUDED.account_id,
+                        name = EXCLUDED.name,
+                        instagram_handle = EXCLUDED.instagram_handle,
+                        tiktok_handle = EXCLUDED.tiktok_handle,
+                        joined_at = EXCLUDED.joined_at,
+                        updated_at = NOW()
+                """, user_rows)
+                self.stats['users_created'] += len(user_rows)
+            
+            if program_rows:
+                cursor.executemany("""
+                    INSERT INTO programs (
+                        program_id, user_id, brand, program_data, started_at
+                    ) VALUES (%s, %s, %s, %s, %s)
+                    ON CONFLICT (program_id) DO UPDATE SET
+                        brand = EXCLUDED.brand,
+                        updated_at = NOW()
+                """, program_rows)
+                self.stats['programs_created'] += len(program_rows)
+            
+            if sales_rows:
+                cursor.executemany("""
+                    INSERT INTO sales_attribution (
+                        attribution_id, program_id, amount, currency, 
+                        attributed_at, attribution_data
+                    ) VALUES (%s, %s, %s, %s, %s, %s)
+                    ON CONFLICT (attribution_id) DO UPDATE SET
+                        amount = EXCLUDED.amount
+                """, sales_rows)
+                self.stats['sales_created'] += len(sales_rows)
+            
+            if task_rows:
+                cursor.executemany("""
+                    INSERT INTO tasks (
+                        task_id, program_id, platform, post_url, 
+                        posted_at, platform_data
+                    ) VALUES (%s, %s, %s, %s, %s, %s)
+                    ON CONFLICT (task_id) DO UPDATE SET
+                        platform = EXCLUDED.platform,
+                        post_url = EXCLUDED.post_url,
+                        posted_at = EXCLUDED.posted_at,
+                        updated_at = NOW()
+                """, task_rows)
+                self.stats['tasks_created'] += len(task_rows)
+            
+            if analytics_rows:
+                cursor.executemany("""
+                    INSERT INTO social_analytics (
+                        analytics_id, task_id, likes, comments, 
+                        shares, reach, additional_metrics, measured_at
+                    ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
+                    ON CONFLICT (task_id, measured_at) DO UPDATE SET
+                        likes = EXCLUDED.likes,
+                        comments = EXCLUDED.comments,
+                        shares = EXCLUDED.shares,
+                        reach = EXCLUDED.reach,
+                        updated_at = NOW()
+                """, analytics_rows)
+                self.stats['analytics_created'] += len(analytics_rows)
             
             # ================================================================
             # STEP 4: Insert Data Quality Issues
             # ================================================================
             # Log all data quality problems encountered during ETL
-            # These are stored for trend analysis and data source improvement
-            for issue in self.data_quality_issues:
-                cursor.execute("""
-                    INSERT INTO data_quality_issues (
+            # These are stored for trend analysis and data source improvement.
+            # Issues are append-only (no ON CONFLICT), so COPY streams them
+            # in a single command.
+            if self.data_quality_issues:
+                with cursor.copy("""
+                    COPY data_quality_issues (
                         issue_id, import_id, severity, issue_type,
                         issue_description, affected_record_id, affected_field,
                         problematic_value
-                    ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
-                """, (
-                    issue.issue_id,
-                    issue.import_id,
-                    issue.severity,
-                    issue.issue_type,
-                    issue.issue_description,
-                    issue.affected_record_id,
-                    issue.affected_field,
-                    Json(issue.problematic_value) if issue.problematic_value else None
-                ))
+                    ) FROM STDIN
+                """) as copy:
+                    for issue in self.data_quality_issues:
+                        copy.write_row((
+                            issue.issue_id,
+                            issue.import_id,
+                            issue.severity,
+                            issue.issue_type,
+                            issue.issue_description,
+                            issue.affected_record_id,
+                            issue.affected_field,
+                            Json(issue.problematic_value) if issue.problematic_value else None
+                        ))
             
             # ================================================================
             # STEP 5: Update Import Record Status
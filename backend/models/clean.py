@@ -113,6 +113,7 @@ class CleanAdvocateUser(BaseModel):
     metadata: Dict[str, Any] = Field(default_factory=dict)
     
     class Config:
+        frozen = True  # Immutable once built by the ETL transform
         json_encoders = {
             UUID: str,
             datetime: lambda v: v.isoformat()
@@ -160,6 +161,7 @@ class CleanProgram(BaseModel):
     completed_at: Optional[datetime] = None
     
     class Config:
+        frozen = True  # Immutable once built by the ETL transform
         json_encoders = {
             UUID: str,
             datetime: lambda v: v.isoformat()
@@ -227,6 +229,7 @@ class CleanTask(BaseModel):
         return str(v) if v else None
     
     class Config:
+        frozen = True  # Immutable once built by the ETL transform
         json_encoders = {
             UUID: str,
             datetime: lambda v: v.isoformat()
@@ -299,11 +302,10 @@ class CleanSocialAnalytics(BaseModel):
         Strategy: Convert negative values to 0 rather than failing.
         This handles data entry errors while preserving the record.
         """
-        if v is not None and v < 0:
-            return 0  # Floor at 0 for invalid negative values
-        return v
+        return None if v is None else max(0, v)  # Floor at 0 for invalid negative values
     
     class Config:
+        frozen = True  # Immutable once built by the ETL transform
         json_encoders = {
             UUID: str,
             datetime: lambda v: v.isoformat()
@@ -329,7 +331,7 @@ class CleanSalesAttribution(BaseModel):
         attribution_data: Flexible JSON field for attribution details
         
     Business Rules:
-        - Amount must be positive (enforced by validator)
+        - Amount must be positive (enforced by Field(gt=0) in pydantic-core)
         - One program can have at most one sales attribution record
         - Amount is stored as Decimal for precise currency handling
         - Currency follows ISO 4217 codes (USD, EUR, GBP, etc.)
@@ -350,28 +352,11 @@ class CleanSalesAttribution(BaseModel):
     """
     attribution_id: UUID = Field(default_factory=uuid4)
     program_id: UUID  # Required foreign key (unique constraint in DB)
-    amount: Decimal   # Required - use Decimal for precise currency handling
+    amount: Decimal = Field(gt=0)  # Required and positive - Decimal for precise currency handling
     currency: str = 'USD'  # ISO 4217 currency code
     attributed_at: datetime = Field(default_factory=datetime.now)
     attribution_data: Dict[str, Any] = Field(default_factory=dict)
     
-    @field_validator('amount')
-    @classmethod
-    def validate_positive_amount(cls, v):
-        """
-        Ensure sales amount is positive
-        
-        Business Rule: Sales attribution must represent actual revenue,
-        which cannot be negative or zero.
-        
-        Strategy: Raise validation error for non-positive amounts.
-        This is stricter than analytics metrics because revenue must
-        be real and positive by definition.
-        """
-        if v <= 0:
-            raise ValueError("Amount must be positive")
-        return v
-    
     class Config:
         json_encoders = {
             UUID: str,
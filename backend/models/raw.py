@@ -29,10 +29,139 @@ Philosophy:
 """
 
 from datetime import datetime
-from typing import Optional, List
-from pydantic import BaseModel, Field, field_validator, model_validator
+from typing import Optional, List, Tuple
+from uuid import UUID
+from pydantic import BaseModel, Field, TypeAdapter, field_validator, model_validator
+import math
 import re
 
+try:
+    from dateutil import parser as date_parser
+except ImportError:
+    date_parser = None  # Fall back to strptime formats below
+
+
+EMAIL_RE = re.compile(r'^[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}$')
+HANDLE_RE = re.compile(r'^[A-Za-z0-9._]+$')
+
+# Canonical platform names, keyed by lowercase input. Every task shares
+# these string objects, which also enables consistent grouping and
+# filtering in analytics.
+PLATFORM_MAP = {
+    'tiktok': 'TikTok',
+    'instagram': 'Instagram',
+    'facebook': 'Facebook',
+    'youtube': 'YouTube',
+    'twitter': 'Twitter',
+    'unknown': 'Unknown',
+}
+
+# Fallback formats tried when dateutil is unavailable or rejects the value
+DATE_FORMATS = (
+    '%Y-%m-%d',
+    '%Y-%m-%dT%H:%M:%S.%fZ',  # ISO with milliseconds
+    '%Y-%m-%dT%H:%M:%S.%f',    # ISO with milliseconds, no Z
+    '%Y-%m-%dT%H:%M:%SZ',       # ISO without milliseconds
+    '%Y-%m-%dT%H:%M:%S',        # ISO without milliseconds or Z
+    '%Y-%m-%d %H:%M:%S',
+    '%m/%d/%Y',
+    '%d/%m/%Y',
+)
+
+
+def _clean_uuid(v) -> Optional[UUID]:
+    """
+    Validate a UUID value and return it as a UUID object, or None
+
+    Cheap checks run first so obviously malformed IDs (wrong type, or too
+    short to hold 32 hex digits) are rejected without paying for the UUID
+    constructor. Every form UUID() accepts still parses, including
+    '{...}' braces and the 'urn:uuid:' prefix.
+    """
+    if v is None:
+        return None
+    if isinstance(v, UUID):
+        return v
+    if not isinstance(v, str) or len(v) < 32:
+        return None
+    try:
+        return UUID(v)
+    except ValueError:
+        return None
+
+
+def _clean_email(v) -> Optional[str]:
+    """
+    Validate an email address and return it lowercased, or None
+
+    Length and '@'/'.' position checks reject most malformed values before
+    the regex runs; EMAIL_RE remains the final check.
+    """
+    if not isinstance(v, str):
+        return None
+    n = len(v)
+    if n < 3 or n > 254:
+        return None
+    at = v.find('@')
+    if at < 1 or at == n - 1 or v.find('@', at + 1) != -1:
+        return None
+    if '.' not in v[at + 1:]:
+        return None
+    return v.lower() if EMAIL_RE.match(v) else None
+
+
+def _clean_date(v) -> Optional[str]:
+    """
+    Parse a date string into ISO 8601 format, or None
+
+    Shared by every date field on the raw models so the parsing rules
+    live in one place.
+    """
+    if isinstance(v, datetime):
+        return v.isoformat()  # Already parsed, nothing to do
+    if v is None or v == '' or v == 'not-a-date' or not isinstance(v, str):
+        return None
+    # Try parsing with dateutil for better ISO format support
+    if date_parser is not None:
+        try:
+            return date_parser.isoparse(v).isoformat()
+        except ValueError:
+            pass
+    for fmt in DATE_FORMATS:
+        try:
+            return datetime.strptime(v, fmt).isoformat()
+        except ValueError:
+            continue
+    return None
+
+
+def _clean_handle(v: str) -> Optional[str]:
+    """Normalize a social handle to '@name' form, or None if malformed"""
+    handle = v.strip().lstrip('@')  # Always strip, then always prefix
+    return '@' + handle if HANDLE_RE.match(handle) else None
+
+
+def _clean_count(v) -> Optional[int]:
+    """
+    Coerce an engagement count to a non-negative int, or None if unusable
+
+    Strings must hold a whole number ("5.7" → None). Negatives are floored
+    to 0, matching the ``>= 0`` CHECK constraints on social_analytics and
+    the clean model's non-negative validator.
+    """
+    if type(v) is int:
+        return v if v >= 0 else 0  # Common case: already a clean int
+    if isinstance(v, str):
+        try:
+            v = int(v)
+        except ValueError:
+            return None
+    if isinstance(v, bool) or not isinstance(v, (int, float)):
+        return None
+    if isinstance(v, float) and not math.isfinite(v):
+        return None
+    return max(0, int(v))
+
 
 class RawSocialAnalytics(BaseModel):
     """
@@ -53,7 +182,7 @@ class RawSocialAnalytics(BaseModel):
         - All fields are optional (many posts have incomplete analytics)
         - Numeric fields may come as strings and need conversion
         - "NaN" strings are normalized to None
-        - Negative values are floored to 0 (reach, impressions)
+        - Negative values are floored to 0
     """
     likes: Optional[int | str] = None  # Can be int, "NaN", or null
     comments: Optional[int] = None
@@ -62,69 +191,22 @@ class RawSocialAnalytics(BaseModel):
     impressions: Optional[int | str] = None  # Similar to likes, can be invalid
     engagement_rate: Optional[float | str] = None  # Can be float or invalid string
     
-    @field_validator('likes', mode='before')
+    @field_validator('likes', 'comments', 'shares', 'reach', 'impressions', mode='before')
     @classmethod
-    def clean_likes(cls, v):
+    def clean_counts(cls, v):
         """
-        Convert 'NaN' strings to None, handle invalid values
+        Normalize engagement counts to non-negative ints or None
         
-        Some data sources export "NaN" (Not a Number) as a string literal
-        instead of null. This validator normalizes these to None.
+        All five count columns share the same rules, so they are cleaned
+        by a single validator in one pass over the record.
         
         Handles:
-            - None, empty string, "NaN" → None
-            - Numeric strings → int
+            - None, empty string, "NaN" / NaN floats → None
+            - Whole-number strings and floats → int ("5.7" → None)
+            - Negative values → 0 (counts can't be negative)
             - Invalid values → None (logged later as data quality issue)
         """
-        if v is None or v == '' or v == 'NaN':
-            return None
-        if isinstance(v, str):
-            try:
-                return int(v)
-            except ValueError:
-                return None
-        return v
-    
-    @field_validator('reach', mode='before')
-    @classmethod
-    def clean_reach(cls, v):
-        """
-        Ensure reach is non-negative
-        
-        Reach represents the number of unique users who saw content,
-        so it cannot be negative. This validator floors negative values
-        at 0 to handle data entry errors.
-        
-        Business Rule: Reach must be >= 0
-        """
-        if v is None:
-            return None
-        if isinstance(v, (int, float)):
-            return max(0, int(v))  # Floor at 0 (can't have negative reach)
-        return None
-    
-    @field_validator('impressions', mode='before')
-    @classmethod
-    def clean_impressions(cls, v):
-        """
-        Convert 'NaN' strings to None, handle invalid values
-        
-        Impressions represent total views (including repeat views by same user).
-        Like reach, this cannot be negative.
-        
-        Handles:
-            - "NaN" strings → None
-            - Negative values → 0
-            - String numbers → int
-        """
-        if v is None or v == '' or v == 'NaN':
-            return None
-        if isinstance(v, str):
-            try:
-                return int(v)
-            except ValueError:
-                return None
-        return max(0, int(v)) if isinstance(v, (int, float)) else None
+        return _clean_count(v)
     
     @field_validator('engagement_rate', mode='before')
     @classmethod
@@ -178,7 +260,9 @@ class RawTask(BaseModel):
         2. Flat: likes: 10, comments: 5 (at task level)
         The flat format is auto-converted to nested during validation.
     """
-    task_id: Optional[str] = None
+    model_config = {'frozen': True}  # Read-only after validation
+    
+    task_id: Optional[UUID] = None
     platform: Optional[str | int] = None  # Can be string or number (data quality issue)
     post_url: Optional[str] = None
     posted_at: Optional[str] = None
@@ -229,14 +313,12 @@ class RawTask(BaseModel):
     @classmethod
     def clean_task_id(cls, v):
         """
-        Convert null or empty strings to None
+        Validate UUID format or return None
         
-        Missing task IDs will be generated during ETL (UUID).
+        Missing or invalid task IDs will be generated during ETL (UUID).
         Empty strings are normalized to None for consistent handling.
         """
-        if v is None or v == '':
-            return None
-        return v
+        return _clean_uuid(v)
     
     @field_validator('platform', mode='before')
     @classmethod
@@ -266,22 +348,9 @@ class RawTask(BaseModel):
         if isinstance(v, (int, float)):
             return None  # ETL will use 'Unknown' as fallback and log the issue
         
-        # Normalize platform names to proper case for consistency
-        # This enables consistent grouping and filtering in analytics
-        platform_map = {
-            'tiktok': 'TikTok',
-            'instagram': 'Instagram',
-            'facebook': 'Facebook',
-            'youtube': 'YouTube',
-            'twitter': 'Twitter',
-            'unknown': 'Unknown'
-        }
-        
-        # Convert to lowercase for case-insensitive matching
-        platform_str = str(v).strip().lower()
-        
-        # Return standardized name or None for unrecognized platforms
-        return platform_map.get(platform_str, None)
+        # Convert to lowercase for case-insensitive matching, then return
+        # the shared canonical name or None for unrecognized platforms
+        return PLATFORM_MAP.get(str(v).strip().lower())
     
     @field_validator('post_url', mode='before')
     @classmethod
@@ -298,51 +367,25 @@ class RawTask(BaseModel):
     @classmethod
     def clean_posted_at(cls, v):
         """Parse date or return None"""
-        if v is None or v == '' or v == 'not-a-date':
-            return None
-        if isinstance(v, str):
-            # Try parsing with dateutil for better ISO format support
-            try:
-                from dateutil import parser as date_parser
-                return date_parser.isoparse(v).isoformat()
-            except (ValueError, ImportError):
-                # Fallback to manual parsing
-                date_formats = [
-                    '%Y-%m-%d',
-                    '%Y-%m-%dT%H:%M:%S.%fZ',  # ISO with milliseconds
-                    '%Y-%m-%dT%H:%M:%S.%f',    # ISO with milliseconds, no Z
-                    '%Y-%m-%dT%H:%M:%SZ',       # ISO without milliseconds
-                    '%Y-%m-%dT%H:%M:%S',        # ISO without milliseconds or Z
-                    '%Y-%m-%d %H:%M:%S',
-                    '%m/%d/%Y',
-                    '%d/%m/%Y'
-                ]
-                for fmt in date_formats:
-                    try:
-                        return datetime.strptime(v, fmt).isoformat()
-                    except ValueError:
-                        continue
-        return None
+        return _clean_date(v)
 
 
 class RawProgram(BaseModel):
     """Raw program data from JSON"""
     model_config = {'populate_by_name': True}  # Allow both 'tasks' and 'tasks_completed'
     
-    program_id: Optional[str] = None
+    program_id: Optional[UUID] = None
     brand: Optional[str | int] = None  # Can be string or number
     sales_attributed: Optional[str | float] = Field(default=None, alias='total_sales_attributed')  # Can be "no-data" or numeric
-    tasks: List[RawTask] = Field(default_factory=list, alias='tasks_completed')
+    tasks: Tuple[RawTask, ...] = Field(default_factory=tuple, alias='tasks_completed')  # Iterated only, never mutated
     started_at: Optional[str] = None
     completed_at: Optional[str] = None
     
     @field_validator('program_id', mode='before')
     @classmethod
     def clean_program_id(cls, v):
-        """Convert empty strings to None"""
-        if v is None or v == '':
-            return None
-        return v
+        """Validate UUID format or return None"""
+        return _clean_uuid(v)
     
     @field_validator('brand', mode='before')
     @classmethod
@@ -373,89 +416,30 @@ class RawProgram(BaseModel):
                 return None
         return None
     
-    @field_validator('started_at', mode='before')
-    @classmethod
-    def clean_started_at(cls, v):
-        """Parse date or return None"""
-        if v is None or v == '' or v == 'not-a-date':
-            return None
-        if isinstance(v, str):
-            # Try parsing with dateutil for better ISO format support
-            try:
-                from dateutil import parser as date_parser
-                return date_parser.isoparse(v).isoformat()
-            except (ValueError, ImportError):
-                # Fallback to manual parsing
-                date_formats = [
-                    '%Y-%m-%d',
-                    '%Y-%m-%dT%H:%M:%S.%fZ',
-                    '%Y-%m-%dT%H:%M:%S.%f',
-                    '%Y-%m-%dT%H:%M:%SZ',
-                    '%Y-%m-%dT%H:%M:%S',
-                    '%Y-%m-%d %H:%M:%S',
-                    '%m/%d/%Y',
-                    '%d/%m/%Y'
-                ]
-                for fmt in date_formats:
-                    try:
-                        return datetime.strptime(v, fmt).isoformat()
-                    except ValueError:
-                        continue
-        return None
-    
-    @field_validator('completed_at', mode='before')
+    @field_validator('started_at', 'completed_at', mode='before')
     @classmethod
-    def clean_completed_at(cls, v):
+    def clean_dates(cls, v):
         """Parse date or return None"""
-        if v is None or v == '' or v == 'not-a-date':
-            return None
-        if isinstance(v, str):
-            # Try parsing with dateutil for better ISO format support
-            try:
-                from dateutil import parser as date_parser
-                return date_parser.isoparse(v).isoformat()
-            except (ValueError, ImportError):
-                # Fallback to manual parsing
-                date_formats = [
-                    '%Y-%m-%d',
-                    '%Y-%m-%dT%H:%M:%S.%fZ',
-                    '%Y-%m-%dT%H:%M:%S.%f',
-                    '%Y-%m-%dT%H:%M:%SZ',
-                    '%Y-%m-%dT%H:%M:%S',
-                    '%Y-%m-%d %H:%M:%S',
-                    '%m/%d/%Y',
-                    '%d/%m/%Y'
-                ]
-                for fmt in date_formats:
-                    try:
-                        return datetime.strptime(v, fmt).isoformat()
-                    except ValueError:
-                        continue
-        return None
+        return _clean_date(v)
 
 
 class RawAdvocateUser(BaseModel):
     """Raw advocate user data from JSON files"""
-    user_id: Optional[str] = None
+    model_config = {'frozen': True}  # Read-only after validation
+    
+    user_id: Optional[UUID] = None
     name: Optional[str] = None
     email: Optional[str] = None  # Will be extracted to create/link advocate account
     instagram_handle: Optional[str] = None
     tiktok_handle: Optional[str] = None
     joined_at: Optional[str] = None
-    advocacy_programs: List[RawProgram] = Field(default_factory=list)
+    advocacy_programs: Tuple[RawProgram, ...] = Field(default_factory=tuple)  # Iterated only, never mutated
     
     @field_validator('user_id', mode='before')
     @classmethod
     def clean_user_id(cls, v):
         """Validate UUID format or return None"""
-        if v is None or v == '':
-            return None
-        try:
-            from uuid import UUID
-            UUID(v)
-            return v
-        except (ValueError, AttributeError):
-            return None
+        return _clean_uuid(v)
     
     @field_validator('name', mode='before')
     @classmethod
@@ -469,16 +453,7 @@ class RawAdvocateUser(BaseModel):
     @classmethod
     def clean_email(cls, v):
         """Validate email format or return None"""
-        if v is None or v == '' or v == 'invalid-email':
-            return None
-        # Basic email validation
-        if not isinstance(v, str) or '@' not in v:
-            return None
-        # More thorough validation
-        email_pattern = r'^[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}$'
-        if re.match(email_pattern, v):
-            return v.lower()
-        return None
+        return _clean_email(v)
     
     @field_validator('instagram_handle', mode='before')
     @classmethod
@@ -486,13 +461,7 @@ class RawAdvocateUser(BaseModel):
         """Clean Instagram handle format"""
         if v is None or v == '':
             return None
-        handle = str(v).strip()
-        # Remove @ if present
-        handle = handle.lstrip('@')
-        # Validate format
-        if re.match(r'^[A-Za-z0-9._]+$', handle):
-            return f"@{handle}"
-        return None
+        return _clean_handle(str(v))
     
     @field_validator('tiktok_handle', mode='before')
     @classmethod
@@ -500,43 +469,33 @@ class RawAdvocateUser(BaseModel):
         """Clean TikTok handle format, handle errors"""
         if v is None or v == '' or not isinstance(v, str):
             return None
-        handle = str(v).strip()
-        # Remove @ if present
-        handle = handle.lstrip('@')
-        # Validate format
-        if re.match(r'^[A-Za-z0-9._]+$', handle):
-            return f"@{handle}"
-        return None
+        return _clean_handle(v)
+    
+    @classmethod
+    def parse_many(cls, payload: bytes | str) -> List['RawAdvocateUser']:
+        """
+        Parse a JSON array of user records in one call
+        
+        Decoding and validation both happen inside pydantic-core, avoiding
+        a json.loads() followed by a per-record RawAdvocateUser(**record) loop.
+        
+        Args:
+            payload: JSON array of user objects (bytes or str)
+            
+        Returns:
+            List of validated RawAdvocateUser models
+        """
+        return _RAW_USER_LIST_ADAPTER.validate_json(payload)
     
     @field_validator('joined_at', mode='before')
     @classmethod
     def clean_joined_at(cls, v):
         """Parse date or return None"""
-        if v is None or v == '' or v == 'not-a-date':
-            return None
-        if isinstance(v, str):
-            # Try parsing with dateutil for better ISO format support
-            try:
-                from dateutil import parser as date_parser
-                return date_parser.isoparse(v).isoformat()
-            except (ValueError, ImportError):
-                # Fallback to manual parsing
-                date_formats = [
-                    '%Y-%m-%d',
-                    '%Y-%m-%dT%H:%M:%S.%fZ',  # ISO with milliseconds
-                    '%Y-%m-%dT%H:%M:%S.%f',    # ISO with milliseconds, no Z
-                    '%Y-%m-%dT%H:%M:%SZ',       # ISO without milliseconds
-                    '%Y-%m-%dT%H:%M:%S',        # ISO without milliseconds or Z
-                    '%Y-%m-%d %H:%M:%S',
-                    '%m/%d/%Y',
-                    '%d/%m/%Y'
-                ]
-                for fmt in date_formats:
-                    try:
-                        return datetime.strptime(v, fmt).isoformat()
-                    except ValueError:
-                        continue
-        return None
+        return _clean_date(v)
+
+
+# Adapter for decoding a JSON array of users in a single pydantic-core pass
+_RAW_USER_LIST_ADAPTER = TypeAdapter(List[RawAdvocateUser])
 
 
 # Backwards compatibility alias
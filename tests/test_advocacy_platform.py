@@ -88,7 +88,7 @@ class TestRawDataValidation:
         assert raw_user.user_id is None
     
     def test_clean_valid_user_id(self):
-        """Test that valid UUIDs are preserved"""
+        """Test that valid UUIDs are parsed into UUID objects"""
         valid_uuid = str(uuid4())
         raw_user = RawUser(
             user_id=valid_uuid,
@@ -97,7 +97,30 @@ class TestRawDataValidation:
             tiktok_handle="@test",
             advocacy_programs=[]
         )
-        assert raw_user.user_id == valid_uuid
+        assert raw_user.user_id == UUID(valid_uuid)
+    
+    def test_clean_braced_and_urn_user_ids(self):
+        """Test that brace-wrapped and urn:uuid: IDs are kept, not dropped"""
+        valid_uuid = uuid4()
+        for user_id in (f"{{{valid_uuid}}}", f"urn:uuid:{valid_uuid}"):
+            raw_user = RawUser(
+                user_id=user_id,
+                email="test@example.com",
+                name="Test User",
+                tiktok_handle="@test",
+                advocacy_programs=[]
+            )
+            assert raw_user.user_id == valid_uuid
+    
+    def test_clean_invalid_program_and_task_ids(self):
+        """Test that malformed program/task IDs are converted to None"""
+        raw_program = RawProgram(
+            program_id="not-a-uuid",
+            brand="Test Brand",
+            tasks=[{"task_id": "12345", "platform": "TikTok"}]
+        )
+        assert raw_program.program_id is None
+        assert raw_program.tasks[0].task_id is None
     
     def test_clean_instagram_handle(self):
         """Test Instagram handle formatting"""
@@ -142,6 +165,15 @@ class TestRawDataValidation:
         )
         assert raw_user.joined_at is not None
     
+    def test_clean_datetime_passthrough(self):
+        """Test that already-parsed datetimes are kept as ISO strings"""
+        raw_user = RawUser(
+            email="test@example.com",
+            joined_at=datetime(2024, 1, 15, 10, 30),
+            advocacy_programs=[]
+        )
+        assert raw_user.joined_at == "2024-01-15T10:30:00"
+    
     def test_clean_date_with_milliseconds(self):
         """Test that ISO dates with milliseconds are parsed correctly"""
         raw_user = RawUser(
@@ -200,6 +232,41 @@ class TestRawDataValidation:
         )
         assert raw_analytics.reach == 0
     
+    def test_clean_float_and_nan_counts(self):
+        """Test that float counts become ints and NaN floats become None"""
+        raw_analytics = RawSocialAnalytics(
+            likes=12.0,
+            comments=float("nan"),
+            shares=-3.0
+        )
+        assert raw_analytics.likes == 12
+        assert raw_analytics.comments is None
+        assert raw_analytics.shares == 0
+    
+    def test_clean_string_float_counts(self):
+        """Test that count strings must be whole numbers"""
+        raw_analytics = RawSocialAnalytics(
+            likes="5.7",
+            comments="12",
+            impressions="1e3"
+        )
+        assert raw_analytics.likes is None
+        assert raw_analytics.comments == 12
+        assert raw_analytics.impressions is None
+    
+    def test_clean_negative_counts(self):
+        """Test that negative counts (ints and strings) are floored to 0"""
+        raw_analytics = RawSocialAnalytics(
+            likes=-5,
+            comments="-2",
+            shares=-1,
+            impressions=-10
+        )
+        assert raw_analytics.likes == 0
+        assert raw_analytics.comments == 0
+        assert raw_analytics.shares == 0
+        assert raw_analytics.impressions == 0
+    
     def test_clean_broken_link(self):
         """Test that broken links are converted to None"""
         raw_task = RawTask(
@@ -286,6 +353,15 @@ class TestRawDataValidation:
         raw_task = RawTask(platform="Unknown")
         assert raw_task.platform == "Unknown"
     
+    def test_raw_models_are_frozen(self):
+        """Test that parsed raw users and tasks are read-only"""
+        raw_user = RawUser(email="test@example.com", advocacy_programs=[])
+        raw_task = RawTask(platform="TikTok")
+        with pytest.raises(ValueError):
+            raw_user.email = "other@example.com"
+        with pytest.raises(ValueError):
+            raw_task.platform = "Instagram"
+    
     def test_clean_impressions(self):
         """Test that impressions are parsed correctly"""
         raw_analytics = RawSocialAnalytics(
@@ -608,6 +684,17 @@ class TestETLPipeline:
         quality_issues = [issue for issue in etl.data_quality_issues if issue.issue_type == 'missing_brand']
         assert len(quality_issues) == 1
         assert "Unknown" in quality_issues[0].issue_description
+    
+    def test_json_dumps_handles_values_orjson_rejects(self):
+        """Test that JSONB serialization survives non-str keys and huge ints"""
+        from backend.etl.pipeline import _json_dumps
+        pytest.importorskip("orjson")
+        
+        value = {'raw_data': {1: 'one', 'big': 2 ** 70}}
+        dumped = _json_dumps(value)
+        if isinstance(dumped, bytes):
+            dumped = dumped.decode('utf-8')
+        assert json.loads(dumped) == {'raw_data': {'1': 'one', 'big': 2 ** 70}}
 
 
 # ============================================================================
@@ -834,6 +921,29 @@ class TestPerformance:
         # Should process 1000 records in less than 1 second
         assert duration < 1.0
         assert len(parsed) == 1000
+    
+    def test_bulk_user_parsing_from_json_array(self):
+        """Test batch parsing a JSON array of user records"""
+        records = [
+            {
+                "user_id": str(uuid4()),
+                "name": f"User {i}",
+                "email": f"User{i}@Example.com",
+                "tiktok_handle": f"user{i}",
+                "advocacy_programs": [
+                    {"brand": "Test Brand", "tasks_completed": [{"platform": "tiktok", "likes": "NaN"}]}
+                ]
+            }
+            for i in range(1000)
+        ]
+        
+        parsed = RawUser.parse_many(json.dumps(records).encode())
+        
+        assert len(parsed) == 1000
+        assert parsed[0].email == "user0@example.com"
+        assert parsed[0].tiktok_handle == "@user0"
+        assert parsed[0].advocacy_programs[0].tasks[0].platform == "TikTok"
+        assert parsed[0].advocacy_programs[0].tasks[0].analytics.likes is None
 
 
 # ============================================================================
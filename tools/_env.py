@@ -0,0 +1,17 @@
+"""
+Shared .env loading for the tools scripts
+"""
+
+import functools
+
+
+@functools.cache
+def load_env() -> None:
+    """
+    Load the .env file into os.environ, once per process.
+    
+    Scripts imported together (e.g. by a wrapper that runs several checks)
+    share the first load instead of re-reading and re-parsing the file.
+    """
+    from dotenv import load_dotenv
+    load_dotenv()
@@ -3,31 +3,85 @@ Diagnostic tool to check ETL import history
 Helps troubleshoot why imports aren't showing on the frontend
 """
 
+import functools
+import io
+import json
 import os
 import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from dotenv import load_dotenv
-import psycopg
-import requests
+
+from _env import load_env
 
 # Set UTF-8 encoding for Windows console
 if sys.platform == 'win32':
     sys.stdout.reconfigure(encoding='utf-8')
 
-# Load environment variables
-load_dotenv()
+# dotenv, psycopg and requests are imported where they are first needed,
+# so importing this module (or a failing run) doesn't pay for loading them
+
+def _load_env():
+    """
+    Load environment variables and read the database and API settings
+    
+    Returns:
+        Tuple of (database connection kwargs, API base URL)
+    """
+    load_env()
+    
+    # Database configuration
+    db_config = {
+        'host': os.getenv('DB_HOST', 'localhost'),
+        'port': int(os.getenv('DB_PORT', '5432')),
+        'dbname': os.getenv('DB_NAME', 'advocacy_platform'),
+        'user': os.getenv('DB_USER', 'postgres'),
+        'password': os.getenv('DB_PASSWORD')
+    }
+    
+    # API configuration
+    api_base_url = os.getenv('API_BASE_URL', 'http://127.0.0.1:8000')
+    
+    return db_config, api_base_url
 
-# Database configuration
-db_config = {
-    'host': os.getenv('DB_HOST', 'localhost'),
-    'port': int(os.getenv('DB_PORT', '5432')),
-    'dbname': os.getenv('DB_NAME', 'advocacy_platform'),
-    'user': os.getenv('DB_USER', 'postgres'),
-    'password': os.getenv('DB_PASSWORD')
-}
+@functools.cache
+def _get_session():
+    """Shared HTTP session so the API probes reuse one keep-alive connection"""
+    import requests
+    from requests.adapters import HTTPAdapter
+    
+    session = requests.Session()
+    session.mount('http://', HTTPAdapter(pool_connections=1, pool_maxsize=4))
+    return session
 
-# API configuration
-API_BASE_URL = os.getenv('API_BASE_URL', 'http://127.0.0.1:8000')
+class _ThreadLocalStdout:
+    """
+    Stand-in for sys.stdout that routes each worker thread's prints to its own
+    buffer, so checks running concurrently don't interleave their output
+    """
+    
+    def __init__(self, stream):
+        self._stream = stream
+        self._local = threading.local()
+    
+    def write(self, text):
+        return getattr(self._local, 'buffer', self._stream).write(text)
+    
+    def flush(self):
+        self._stream.flush()
+    
+    def capture(self, check, *args):
+        """
+        Run a check with this thread's output buffered
+        
+        Returns:
+            Tuple of (check result, captured output)
+        """
+        self._local.buffer = buffer = io.StringIO()
+        try:
+            return check(*args), buffer.getvalue()
+        finally:
+            del self._local.buffer
 
 def print_section(title):
     """Print a section header"""
@@ -35,116 +89,143 @@ def print_section(title):
     print(f" {title}")
     print("=" * 80)
 
-def check_database_connection():
-    """Check if database is accessible"""
+def check_database_connection(db_config):
+    """
+    Check if database is accessible
+    
+    Args:
+        db_config: Connection kwargs for psycopg.connect()
+    
+    Returns:
+        The open connection so the remaining checks can reuse it instead of
+        reconnecting, or None if the database is unreachable
+    """
     print_section("1. DATABASE CONNECTION")
     try:
-        with psycopg.connect(**db_config) as conn:
-            cursor = conn.cursor()
-            cursor.execute("SELECT version();")
-            version = cursor.fetchone()[0]
-            print(f"✅ Database connected successfully")
-            print(f"   PostgreSQL version: {version[:50]}...")
-            return True
+        import psycopg
+        
+        conn = psycopg.connect(**db_config)
+        version = conn.execute("SELECT version();").fetchone()[0]
+        print(f"✅ Database connected successfully")
+        print(f"   PostgreSQL version: {version[:50]}...")
+        return conn
     except Exception as e:
         print(f"❌ Database connection failed: {e}")
-        return False
+        return None
 
-def check_raw_imports_table():
-    """Check if raw_imports table exists and has data"""
+def check_raw_imports_table(conn, exact=False):
+    """
+    Check if raw_imports table exists and has data
+    
+    Args:
+        conn: Open connection returned by check_database_connection()
+        exact: If True, always COUNT(*) the table instead of using the
+            planner's row estimate
+    """
     print_section("2. RAW_IMPORTS TABLE")
+    import psycopg
+    
     try:
-        with psycopg.connect(**db_config) as conn:
-            cursor = conn.cursor()
-            
-            # Check if table exists
-            cursor.execute("""
-                SELECT EXISTS (
-                    SELECT FROM information_schema.tables 
-                    WHERE table_name = 'raw_imports'
-                );
-            """)
-            exists = cursor.fetchone()[0]
-            
-            if not exists:
-                print("❌ Table 'raw_imports' does not exist!")
-                print("   Run: psql -U postgres -d advocacy_platform -f schema/schema.sql")
-                return False
-            
-            print("✅ Table 'raw_imports' exists")
-            
-            # Check row count
-            cursor.execute("SELECT COUNT(*) FROM raw_imports;")
-            count = cursor.fetchone()[0]
-            print(f"   Total imports in database: {count}")
-            
-            if count == 0:
-                print("\n⚠️  No imports found in database!")
-                print("   This is why nothing shows on the import page.")
-                print("   Run an ETL import: python etl_pipeline.py")
-                return False
-            
-            # Show last 5 imports
-            cursor.execute("""
-                SELECT 
-                    import_id,
-                    file_name,
-                    processing_status,
-                    records_count,
-                    imported_at,
-                    processing_completed_at
-                FROM raw_imports
-                ORDER BY imported_at DESC
-                LIMIT 5;
-            """)
-            
-            rows = cursor.fetchall()
-            print(f"\n   Last {len(rows)} imports:")
-            print("   " + "-" * 76)
-            
-            for row in rows:
-                import_id, file_name, status, records, imported_at, completed_at = row
-                print(f"   ID: {str(import_id)[:8]}... | Status: {status:12} | Records: {records or 0:5} | {imported_at}")
-            
-            return True
-            
+        # Queue the row count and the last 5 imports in a pipeline so both
+        # reach the server in a single round trip; if the table is missing,
+        # the regclass lookup fails with UndefinedTable
+        if exact:
+            count_query = "SELECT false, COUNT(*) FROM raw_imports;"
+        else:
+            # pg_class.reltuples is a single catalog read; the COUNT(*)
+            # subquery only runs when there is no positive estimate (never
+            # analyzed, or possibly empty)
+            count_query = """
+                SELECT reltuples > 0,
+                       CASE WHEN reltuples > 0 THEN reltuples::bigint
+                            ELSE (SELECT COUNT(*) FROM raw_imports) END
+                FROM pg_class
+                WHERE oid = 'public.raw_imports'::regclass;
+            """
+        try:
+            with conn.pipeline():
+                count_cursor = conn.execute(count_query)
+                last_cursor = conn.execute("""
+                    SELECT 
+                        import_id,
+                        file_name,
+                        processing_status,
+                        records_count,
+                        imported_at,
+                        processing_completed_at
+                    FROM raw_imports
+                    ORDER BY imported_at DESC
+                    LIMIT 5;
+                """)
+        except psycopg.errors.UndefinedTable:
+            print("❌ Table 'raw_imports' does not exist!")
+            print("   Run: psql -U postgres -d advocacy_platform -f schema/schema.sql")
+            return False
+        
+        print("✅ Table 'raw_imports' exists")
+        
+        # Check row count
+        estimated, count = count_cursor.fetchone()
+        print(f"   Total imports in database: {count}{' (estimate)' if estimated else ''}")
+        
+        if count == 0:
+            print("\n⚠️  No imports found in database!")
+            print("   This is why nothing shows on the import page.")
+            print("   Run an ETL import: python etl_pipeline.py")
+            return False
+        
+        # Show last 5 imports
+        # Iterate the cursor rather than fetchall(): rows are converted one
+        # at a time, with no intermediate list however large the LIMIT
+        print(f"\n   Last {last_cursor.rowcount} imports:")
+        print("   " + "-" * 76)
+        
+        for row in last_cursor:
+            import_id, file_name, status, records, imported_at, completed_at = row
+            print(f"   ID: {str(import_id)[:8]}... | Status: {status:12} | Records: {records or 0:5} | {imported_at}")
+        
+        return True
+        
     except Exception as e:
         print(f"❌ Error checking raw_imports: {e}")
         return False
 
-def check_api_server():
-    """Check if API server is running"""
+def check_api_history_endpoint(api_base_url):
+    """
+    Check that the API server is running and the /api/v1/etl/history
+    endpoint works
+    
+    One request answers both: a connection error means the server is down,
+    any response means it is up, so no separate /health probe is made.
+    
+    Returns:
+        Tuple of (server running, endpoint working)
+    """
+    import requests
+    
     print_section("3. API SERVER")
     try:
-        response = requests.get(f"{API_BASE_URL}/health", timeout=3)
-        if response.status_code == 200:
-            print(f"✅ API server is running at {API_BASE_URL}")
-            return True
-        else:
-            print(f"⚠️  API server responded with status {response.status_code}")
-            return False
+        response = _get_session().get(f"{api_base_url}/api/v1/etl/history?limit=5", timeout=5)
     except requests.exceptions.ConnectionError:
-        print(f"❌ Cannot connect to API server at {API_BASE_URL}")
+        print(f"❌ Cannot connect to API server at {api_base_url}")
         print("   Start the server: uvicorn api:app --reload")
-        return False
+        return False, False
     except Exception as e:
         print(f"❌ Error connecting to API: {e}")
-        return False
-
-def check_api_history_endpoint():
-    """Check if the /api/v1/etl/history endpoint works"""
+        return False, False
+    
+    print(f"✅ API server is running at {api_base_url}")
+    
     print_section("4. API HISTORY ENDPOINT")
     try:
-        response = requests.get(f"{API_BASE_URL}/api/v1/etl/history?limit=5", timeout=5)
-        
         if response.status_code != 200:
             print(f"❌ API returned status {response.status_code}")
             print(f"   Response: {response.text[:200]}")
-            return False
+            return True, False
         
         data = response.json()
         print("✅ API endpoint is working")
-        print(f"   Endpoint: {API_BASE_URL}/api/v1/etl/history")
+        print(f"   Endpoint: {api_base_url}/api/v1/etl/history")
         print(f"   Total runs returned: {data.get('total', 0)}")
         print(f"   Orchestration available: {data.get('orchestration_available', False)}")
         
@@ -162,13 +243,13 @@ def check_api_history_endpoint():
         else:
             print("\n   ⚠️  API returned 0 runs (but table might have data)")
         
-        return True
+        return True, True
         
     except Exception as e:
         print(f"❌ Error testing API endpoint: {e}")
-        return False
+        return True, False
 
-def check_frontend_config():
+def check_frontend_config(api_base_url):
     """Check frontend configuration"""
     print_section("5. FRONTEND CONFIGURATION")
     
@@ -188,7 +269,7 @@ def check_frontend_config():
         print(f"⚠️  No frontend config file at {frontend_env_path}")
         print("   Frontend will use default: http://127.0.0.1:8000")
     
-    print(f"\n   Expected API URL: {API_BASE_URL}")
+    print(f"\n   Expected API URL: {api_base_url}")
 
 def check_browser_console():
     """Provide instructions for checking browser console"""
@@ -202,27 +283,64 @@ def check_browser_console():
     print("   6. Look for the request to /api/v1/etl/history")
     print("   7. Check if it's returning data")
 
-def main():
-    """Run all diagnostic checks"""
-    print("\n" + "=" * 80)
-    print("ETL IMPORT HISTORY DIAGNOSTIC TOOL")
-    print("=" * 80)
+def _database_checks(db_config, exact=False):
+    """Run the database checks, sharing one connection between them"""
+    conn = check_database_connection(db_config)
+    if conn is None:
+        return False, False
+    with conn:
+        return True, check_raw_imports_table(conn, exact)
+
+def main(exact=False, as_json=False):
+    """
+    Run all diagnostic checks
+    
+    Args:
+        exact: If True, count raw_imports rows exactly instead of estimating
+        as_json: If True, write only the check results as one JSON object
+    """
+    if not as_json:
+        print("\n" + "=" * 80)
+        print("ETL IMPORT HISTORY DIAGNOSTIC TOOL")
+        print("=" * 80)
     
+    db_config, api_base_url = _load_env()
+    
+    # The database, API and frontend checks are independent network/file
+    # probes, so run them concurrently and print their buffered output in order
+    stdout = sys.stdout
+    router = _ThreadLocalStdout(stdout)
+    sys.stdout = router
+    try:
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            db_future = executor.submit(router.capture, _database_checks, db_config, exact)
+            api_future = executor.submit(router.capture, check_api_history_endpoint, api_base_url)
+            frontend_future = executor.submit(router.capture, check_frontend_config, api_base_url)
+            (database_ok, raw_imports_ok), db_output = db_future.result()
+            (api_server_ok, api_endpoint_ok), api_output = api_future.result()
+            _, frontend_output = frontend_future.result()
+    finally:
+        sys.stdout = stdout
+    
+    # API results only count when the database is reachable
     results = {
-        'database': check_database_connection(),
-        'raw_imports': False,
-        'api_server': False,
-        'api_endpoint': False
+        'database': database_ok,
+        'raw_imports': raw_imports_ok,
+        'api_server': database_ok and api_server_ok,
+        'api_endpoint': database_ok and api_endpoint_ok
     }
     
-    if results['database']:
-        results['raw_imports'] = check_raw_imports_table()
-        results['api_server'] = check_api_server()
-        
-        if results['api_server']:
-            results['api_endpoint'] = check_api_history_endpoint()
+    if as_json:
+        # For scripts and CI: skip the report, its captured check output
+        # and the summary/recommendation formatting
+        sys.stdout.write(json.dumps(results) + "\n")
+        return
     
-    check_frontend_config()
+    sys.stdout.write(db_output)
+    if database_ok:
+        sys.stdout.write(api_output)
+    
+    sys.stdout.write(frontend_output)
     check_browser_console()
     
     # Summary
@@ -267,5 +385,22 @@ def main():
         print("   4. Check that frontend is pointing to correct API URL")
 
 if __name__ == '__main__':
-    main()
+    import argparse
+    
+    parser = argparse.ArgumentParser(
+        description='Diagnose why ETL imports are not showing on the frontend'
+    )
+    parser.add_argument(
+        '--exact',
+        action='store_true',
+        help='Count raw_imports rows exactly instead of using the planner estimate'
+    )
+    parser.add_argument(
+        '--json',
+        action='store_true',
+        help='Print only the check results as JSON'
+    )
+    
+    args = parser.parse_args()
+    main(exact=args.exact, as_json=args.json)
 
@@ -6,136 +6,216 @@ Validates that all JSON files follow the expected schema structure
 """
 
 import json
+import mmap
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
+# Try to import orjson (optional dependency, parses bytes several times faster)
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    orjson = None
+    _json_loads = json.loads
 
-def check_schema_consistency(data_dir: str = "../data"):
+# Files above this size are parsed straight from a memory map (orjson only),
+# so a large file is never held twice (raw bytes plus parsed tree)
+MMAP_MIN_SIZE = 64 * 1024
+
+
+# Expected schema structure (module level so worker processes share them)
+EXPECTED_TOP_KEYS = frozenset({
+    'user_id', 'name', 'email', 'instagram_handle',
+    'tiktok_handle', 'joined_at', 'advocacy_programs'
+})
+EXPECTED_PROGRAM_KEYS = frozenset({
+    'program_id', 'brand', 'tasks_completed', 'total_sales_attributed'
+})
+EXPECTED_TASK_KEYS = frozenset({
+    'task_id', 'platform', 'post_url', 'likes',
+    'comments', 'shares', 'reach'
+})
+
+
+def _validate_file(json_file: str):
+    """
+    Parse one JSON file and check it against the expected schema
+    (runs in a worker process).
+    
+    Args:
+        json_file: Path string of the file to check
+    
+    Returns:
+        (file name, parse error or None, list of schema issues); issues are
+        left unformatted (see _format_issue), since only a few get printed
+    """
+    name = os.path.basename(json_file)
+    issues = []
+    try:
+        if orjson is not None and os.path.getsize(json_file) > MMAP_MIN_SIZE:
+            with open(json_file, 'rb') as f, \
+                    mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped, \
+                    memoryview(mapped) as view:
+                data = orjson.loads(view)
+        else:
+            # Both parsers take bytes directly, skipping a separate text decode
+            with open(json_file, 'rb') as f:
+                data = _json_loads(f.read())
+        
+        # Check top-level keys (dict views compare against sets directly)
+        if data.keys() != EXPECTED_TOP_KEYS:
+            issues.append((name, 'Top-level', None, tuple(data.keys())))
+            return name, None, issues
+        
+        # Local names for the per-program and per-task loops, so each
+        # comparison doesn't repeat a global lookup
+        expected_program_keys = EXPECTED_PROGRAM_KEYS
+        expected_task_keys = EXPECTED_TASK_KEYS
+        
+        # Check advocacy_programs structure. Non-object entries are rare, so
+        # ask each entry for its keys and skip the ones without (EAFP)
+        # rather than isinstance-checking every program and task
+        programs = data.get('advocacy_programs')
+        if isinstance(programs, list):
+            for idx, program in enumerate(programs):
+                try:
+                    program_keys = program.keys()
+                except AttributeError:
+                    continue
+                if program_keys != expected_program_keys:
+                    issues.append((name, 'Program', idx, tuple(program_keys)))
+                    break
+                
+                # Check tasks_completed structure
+                tasks = program.get('tasks_completed')
+                if isinstance(tasks, list):
+                    for task_idx, task in enumerate(tasks):
+                        try:
+                            task_keys = task.keys()
+                        except AttributeError:
+                            continue
+                        if task_keys != expected_task_keys:
+                            issues.append((name, 'Task', task_idx, tuple(task_keys)))
+                            break
+        
+        return name, None, issues
+        
+    except json.JSONDecodeError as e:
+        # orjson.JSONDecodeError subclasses json.JSONDecodeError
+        return name, f'{name}: {str(e)}', issues
+    except Exception as e:
+        return name, f'{name}: Error - {str(e)}', issues
+
+
+def _format_issue(issue) -> str:
+    """Render a (file name, level, index, keys) schema issue for the report"""
+    name, level, index, keys = issue
+    where = level if index is None else f'{level} {index}'
+    return f'{name}: {where} keys mismatch - {set(keys)}'
+
+
+def check_schema_consistency(data_dir: str = "../data", processes: int = None):
     """
     Checks schema consistency across all JSON files in the data directory.
     
     Args:
         data_dir: Path to the data directory (default: ../data)
+        processes: Worker processes used to parse files (default: one per
+            CPU; 1 checks every file in this process)
     """
     data_path = Path(__file__).parent / data_dir
-    json_files = sorted(data_path.glob('user_*.json'))
+    
+    # One scandir pass: no glob matching or Path object per entry
+    with os.scandir(data_path) as entries:
+        json_files = sorted(
+            entry.path for entry in entries
+            if entry.name.startswith('user_') and entry.name.endswith('.json') and entry.is_file()
+        )
     
     print('='*60)
     print('SCHEMA CONSISTENCY CHECK')
     print('='*60)
     print(f'\nScanning {len(json_files)} JSON files...\n')
     
-    # Expected schema structure
-    expected_top_keys = {
-        'user_id', 'name', 'email', 'instagram_handle', 
-        'tiktok_handle', 'joined_at', 'advocacy_programs'
-    }
-    expected_program_keys = {
-        'program_id', 'brand', 'tasks_completed', 'total_sales_attributed'
-    }
-    expected_task_keys = {
-        'task_id', 'platform', 'post_url', 'likes', 
-        'comments', 'shares', 'reach'
-    }
-    
     schema_issues = []
     malformed_json = []
     valid_files = 0
     
-    for json_file in json_files:
-        try:
-            with open(json_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-            
-            # Check top-level keys
-            top_keys = set(data.keys())
-            if top_keys != expected_top_keys:
-                schema_issues.append(
-                    f'{json_file.name}: Top-level keys mismatch - {top_keys}'
-                )
-                continue
-            
-            # Check advocacy_programs structure
-            if 'advocacy_programs' in data and isinstance(data['advocacy_programs'], list):
-                for idx, program in enumerate(data['advocacy_programs']):
-                    if isinstance(program, dict):
-                        program_keys = set(program.keys())
-                        if program_keys != expected_program_keys:
-                            schema_issues.append(
-                                f'{json_file.name}: Program {idx} keys mismatch - {program_keys}'
-                            )
-                            break
-                        
-                        # Check tasks_completed structure
-                        if 'tasks_completed' in program and isinstance(program['tasks_completed'], list):
-                            for task_idx, task in enumerate(program['tasks_completed']):
-                                if isinstance(task, dict):
-                                    task_keys = set(task.keys())
-                                    if task_keys != expected_task_keys:
-                                        schema_issues.append(
-                                            f'{json_file.name}: Task {task_idx} keys mismatch - {task_keys}'
-                                        )
-                                        break
-            
-            if not any(json_file.name in issue for issue in schema_issues):
-                valid_files += 1
-                
-        except json.JSONDecodeError as e:
-            malformed_json.append(f'{json_file.name}: {str(e)}')
-        except Exception as e:
-            malformed_json.append(f'{json_file.name}: Error - {str(e)}')
+    # Files are independent and parsing is CPU bound, so spread them
+    # across processes; map() keeps results in file order
+    if processes == 1:
+        results = list(map(_validate_file, json_files))
+    else:
+        with ProcessPoolExecutor(max_workers=processes) as executor:
+            results = list(executor.map(_validate_file, json_files, chunksize=64))
     
-    # Print results
-    print(f'Total files: {len(json_files)}')
-    print(f'Valid files with correct schema: {valid_files}')
-    print(f'Malformed JSON files: {len(malformed_json)}')
-    print(f'Valid JSON but schema mismatches: {len(schema_issues)}')
+    for _, error, issues in results:
+        if error is not None:
+            malformed_json.append(error)
+        elif issues:
+            schema_issues.extend(issues)
+        else:
+            valid_files += 1
+    
+    # Print results (collected and written to stdout in one go)
+    out = []
+    add = out.append
+    
+    add(f'Total files: {len(json_files)}')
+    add(f'Valid files with correct schema: {valid_files}')
+    add(f'Malformed JSON files: {len(malformed_json)}')
+    add(f'Valid JSON but schema mismatches: {len(schema_issues)}')
     
     if malformed_json:
-        print(f'\n[!] WARNING: {len(malformed_json)} files have JSON parsing errors')
-        print('First 5 examples:')
+        add(f'\n[!] WARNING: {len(malformed_json)} files have JSON parsing errors')
+        add('First 5 examples:')
         for issue in malformed_json[:5]:
-            print(f'  - {issue}')
+            add(f'  - {issue}')
         if len(malformed_json) > 5:
-            print(f'  ... and {len(malformed_json) - 5} more')
+            add(f'  ... and {len(malformed_json) - 5} more')
     
     if schema_issues:
-        print(f'\n[!] WARNING: {len(schema_issues)} files have schema mismatches')
-        print('First 5 examples:')
+        add(f'\n[!] WARNING: {len(schema_issues)} files have schema mismatches')
+        add('First 5 examples:')
         for issue in schema_issues[:5]:
-            print(f'  - {issue}')
+            add(f'  - {_format_issue(issue)}')
         if len(schema_issues) > 5:
-            print(f'  ... and {len(schema_issues) - 5} more')
+            add(f'  ... and {len(schema_issues) - 5} more')
     
     if not schema_issues and not malformed_json:
-        print('\n[OK] SUCCESS: All files have consistent schema!')
+        add('\n[OK] SUCCESS: All files have consistent schema!')
     elif not schema_issues:
-        print('\n[OK] SCHEMA CONSISTENT: All parseable JSON files have the same schema structure')
+        add('\n[OK] SCHEMA CONSISTENT: All parseable JSON files have the same schema structure')
     
     # Display expected schema
-    print('\n' + '='*60)
-    print('EXPECTED SCHEMA STRUCTURE')
-    print('='*60)
-    print('Top-level fields:')
-    print('  - user_id')
-    print('  - name')
-    print('  - email')
-    print('  - instagram_handle')
-    print('  - tiktok_handle')
-    print('  - joined_at')
-    print('  - advocacy_programs (array)')
-    print('\nadvocacy_programs[] fields:')
-    print('  - program_id')
-    print('  - brand')
-    print('  - tasks_completed (array)')
-    print('  - total_sales_attributed')
-    print('\ntasks_completed[] fields:')
-    print('  - task_id')
-    print('  - platform')
-    print('  - post_url')
-    print('  - likes')
-    print('  - comments')
-    print('  - shares')
-    print('  - reach')
+    add('\n' + '='*60)
+    add('EXPECTED SCHEMA STRUCTURE')
+    add('='*60)
+    add('Top-level fields:')
+    add('  - user_id')
+    add('  - name')
+    add('  - email')
+    add('  - instagram_handle')
+    add('  - tiktok_handle')
+    add('  - joined_at')
+    add('  - advocacy_programs (array)')
+    add('\nadvocacy_programs[] fields:')
+    add('  - program_id')
+    add('  - brand')
+    add('  - tasks_completed (array)')
+    add('  - total_sales_attributed')
+    add('\ntasks_completed[] fields:')
+    add('  - task_id')
+    add('  - platform')
+    add('  - post_url')
+    add('  - likes')
+    add('  - comments')
+    add('  - shares')
+    add('  - reach')
+    
+    sys.stdout.write('\n'.join(out) + '\n')
     
     return {
         'total': len(json_files),
@@ -157,7 +237,14 @@ if __name__ == '__main__':
         help='Path to data directory (default: ../data)'
     )
     
+    parser.add_argument(
+        '--processes',
+        type=int,
+        default=None,
+        help='Worker processes for parsing files (default: one per CPU)'
+    )
+    
     args = parser.parse_args()
-    check_schema_consistency(args.data_dir)
+    check_schema_consistency(args.data_dir, processes=args.processes)
 
 
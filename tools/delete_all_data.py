@@ -4,61 +4,149 @@ Delete All Data Script
 Safely removes all data from database tables while preserving schema
 """
 
+import functools
 import os
 import sys
-from dotenv import load_dotenv
+from concurrent.futures import ThreadPoolExecutor
 
-# Import psycopg3
-import psycopg as db
+from _env import load_env
 
-# Load environment variables
-load_dotenv()
+@functools.cache
+def get_db_config():
+    """
+    Database configuration, read from the environment once per process
+    
+    Returns:
+        Connection kwargs for psycopg.connect()
+    """
+    # Load environment variables
+    load_env()
+    
+    return {
+        'host': os.getenv('DB_HOST', 'localhost'),
+        'port': int(os.getenv('DB_PORT', '5432')),
+        'user': os.getenv('DB_USER', 'postgres'),
+        'password': os.getenv('DB_PASSWORD'),
+        'dbname': os.getenv('DB_NAME', 'advocacy_platform')  # psycopg3 uses 'dbname'
+    }
 
-# Database configuration
-db_config = {
-    'host': os.getenv('DB_HOST', 'localhost'),
-    'port': int(os.getenv('DB_PORT', '5432')),
-    'user': os.getenv('DB_USER', 'postgres'),
-    'password': os.getenv('DB_PASSWORD'),
-    'dbname': os.getenv('DB_NAME', 'advocacy_platform')  # psycopg3 uses 'dbname'
-}
+# Tables reached from the given root tables by following foreign keys
+# backwards, i.e. everything TRUNCATE ... CASCADE on the roots will empty
+CASCADE_TABLES_QUERY = """
+    WITH RECURSIVE dependents(oid) AS (
+        SELECT c.oid
+        FROM pg_class c
+        JOIN pg_namespace n ON n.oid = c.relnamespace
+        WHERE n.nspname = 'public' AND c.relname = ANY(%s)
+        UNION
+        SELECT con.conrelid
+        FROM pg_constraint con
+        JOIN dependents d ON con.confrelid = d.oid
+        WHERE con.contype = 'f'
+    )
+    SELECT c.relname
+    FROM dependents d
+    JOIN pg_class c ON c.oid = d.oid
+    ORDER BY c.relname;
+"""
 
-def get_table_counts(cursor):
-    """Get row counts for all tables"""
-    cursor.execute("""
-        SELECT 
-            table_name,
-            (xpath('/row/count/text()', 
-                   query_to_xml(format('select count(*) as count from %I.%I', 
-                   table_schema, table_name), 
-                   false, true, ''))
-            )[1]::text::int AS row_count
-        FROM information_schema.tables
-        WHERE table_schema = 'public'
-        AND table_type = 'BASE TABLE'
-        ORDER BY table_name;
-    """)
-    return cursor.fetchall()
+# Planner row estimates for every table: a catalog read, no table scans
+TABLE_ESTIMATES_QUERY = """
+    SELECT c.relname, c.reltuples::bigint
+    FROM pg_class c
+    JOIN pg_namespace n ON n.oid = c.relnamespace
+    WHERE n.nspname = 'public' AND c.relkind IN ('r', 'p')
+    ORDER BY c.relname;
+"""
+
+def _count_rows(cursor, tables):
+    """Exact row counts for the given tables, in a single UNION ALL query"""
+    from psycopg import sql
+    
+    cursor.execute(sql.SQL(" UNION ALL ").join(
+        sql.SQL("SELECT {}, count(*) FROM {}").format(
+            sql.Literal(table), sql.Identifier('public', table)
+        )
+        for table in tables
+    ))
+    return dict(cursor.fetchall())
+
+def get_table_counts(cursor, exact=False):
+    """
+    Get row counts for all tables
+    
+    Args:
+        cursor: Database cursor
+        exact: If True, COUNT(*) every table. Otherwise use the planner's
+            estimates (pg_class.reltuples) and only count the tables without
+            a positive estimate (never analyzed, just truncated, or empty)
+    
+    Returns:
+        List of (table name, row count, is estimate) tuples ordered by
+        table name
+    """
+    cursor.execute(TABLE_ESTIMATES_QUERY)
+    estimates = cursor.fetchall()
+    
+    to_count = [table for table, estimate in estimates if exact or estimate <= 0]
+    exact_counts = _count_rows(cursor, to_count) if to_count else {}
+    
+    return [
+        (table, exact_counts[table], False) if table in exact_counts else (table, estimate, True)
+        for table, estimate in estimates
+    ]
+
+def _refresh_view(db_config, view):
+    """
+    Refresh one materialized view on its own connection (runs in a worker thread)
+    
+    Args:
+        db_config: Connection kwargs for psycopg.connect()
+        view: Name of the materialized view
+    
+    Returns:
+        None on success, otherwise the exception raised
+    """
+    import psycopg as db
+    
+    try:
+        with db.connect(**db_config, autocommit=True) as conn:
+            try:
+                # CONCURRENTLY keeps the view readable while it refreshes
+                conn.execute(f"REFRESH MATERIALIZED VIEW CONCURRENTLY {view};")
+            except (db.errors.ObjectNotInPrerequisiteState, db.errors.FeatureNotSupported):
+                # Needs a unique index and an already populated view
+                conn.execute(f"REFRESH MATERIALIZED VIEW {view};")
+        return None
+    except Exception as e:
+        return e
 
-def delete_all_data(confirm=True, verbose=True):
+def delete_all_data(confirm=True, verbose=True, exact=False, db_config=None):
     """
     Delete all data from database tables
     
     Args:
         confirm: If True, ask for user confirmation before deleting
         verbose: If True, show detailed progress
+        exact: If True, report exact row counts instead of planner estimates
+        db_config: Connection kwargs (default: get_db_config())
     """
+    db_config = db_config or get_db_config()
+    
     print("="*80)
     print("DELETE ALL DATA FROM DATABASE")
     print("="*80)
     
+    # Import psycopg3 here so --help and the missing-password check stay fast
+    import psycopg as db
+    
     try:
         # Connect to database
         conn = db.connect(**db_config)
         cursor = conn.cursor()
         
         if verbose:
-            print(f"\n[1] Connected to database: {os.getenv('DB_NAME', 'advocacy_platform')}")
+            print(f"\n[1] Connected to database: {db_config['dbname']}")
         
         # Get current row counts
         if verbose:
@@ -66,13 +154,15 @@ def delete_all_data(confirm=True, verbose=True):
             print("-" * 60)
             
         try:
-            counts = get_table_counts(cursor)
+            counts = get_table_counts(cursor, exact)
             total_rows = 0
+            any_estimated = False
             
-            for table_name, row_count in counts:
+            for table_name, row_count, estimated in counts:
                 if row_count > 0:
-                    print(f"    {table_name:30} {row_count:>10} rows")
+                    print(f"    {table_name:30} {row_count:>10} rows{' (estimate)' if estimated else ''}")
                     total_rows += row_count
+                    any_estimated = any_estimated or estimated
             
             if total_rows == 0:
                 print("    [No data found in any tables]")
@@ -81,10 +171,10 @@ def delete_all_data(confirm=True, verbose=True):
                 return
             
             print("-" * 60)
-            print(f"    {'TOTAL':30} {total_rows:>10} rows")
+            print(f"    {'TOTAL':30} {total_rows:>10} rows{' (estimate)' if any_estimated else ''}")
             
         except Exception as e:
-            print(f"    [Could not get exact counts: {e}]")
+            print(f"    [Could not get row counts: {e}]")
             print("    [Will proceed with deletion anyway]")
         
         # Confirmation
@@ -102,38 +192,31 @@ def delete_all_data(confirm=True, verbose=True):
                 conn.close()
                 return
         
-        # Delete data in correct order (respecting foreign keys)
+        # Delete data (dependent tables are emptied through their foreign keys)
         print("\n[3] Deleting data from tables...")
         print("-" * 60)
         
         # Start transaction
         cursor.execute("BEGIN;")
         
-        # Order matters due to foreign key constraints
-        # Delete in reverse dependency order
-        tables_to_truncate = [
-            'data_quality_issues',    # References raw_imports
-            'social_analytics',       # References tasks
-            'sales_attribution',      # References programs
-            'tasks',                  # References programs
-            'programs',               # References advocate_users
-            'advocate_users',         # References advocate_accounts
-            'advocate_accounts',      # Parent table (no dependencies)
-            'raw_imports'            # Referenced by data_quality_issues
-        ]
+        # advocate_accounts and raw_imports are the roots of the foreign key
+        # chains: truncating them with CASCADE also empties every table that
+        # references them (advocate_users, programs, tasks, social_analytics,
+        # sales_attribution, data_quality_issues) in one statement, with one
+        # set of locks instead of a round trip per table
+        root_tables = ['advocate_accounts', 'raw_imports']
         
-        deleted_tables = []
+        # List the tables the cascade covers, for the report
+        cursor.execute(CASCADE_TABLES_QUERY, (root_tables,))
+        deleted_tables = [row[0] for row in cursor.fetchall()]
         
-        for table in tables_to_truncate:
-            try:
-                # TRUNCATE is faster than DELETE and resets sequences
-                cursor.execute(f"TRUNCATE TABLE {table} CASCADE;")
-                deleted_tables.append(table)
-                if verbose:
-                    print(f"    [OK] Truncated: {table}")
-            except Exception as e:
-                if verbose:
-                    print(f"    [SKIP] {table}: {e}")
+        cursor.execute(
+            "TRUNCATE TABLE advocate_accounts, raw_imports RESTART IDENTITY CASCADE;"
+        )
+        
+        if verbose:
+            for table in deleted_tables:
+                print(f"    [OK] Truncated: {table}")
         
         # Commit transaction
         conn.commit()
@@ -151,15 +234,16 @@ def delete_all_data(confirm=True, verbose=True):
             'mv_brand_performance'
         ]
         
-        for view in materialized_views:
-            try:
-                cursor.execute(f"REFRESH MATERIALIZED VIEW {view};")
-                conn.commit()
-                if verbose:
+        # The views are independent, so refresh them in parallel sessions
+        with ThreadPoolExecutor(max_workers=len(materialized_views)) as executor:
+            errors = list(executor.map(functools.partial(_refresh_view, db_config), materialized_views))
+        
+        for view, error in zip(materialized_views, errors):
+            if verbose:
+                if error is None:
                     print(f"    [OK] Refreshed: {view}")
-            except Exception as e:
-                if verbose:
-                    print(f"    [SKIP] {view}: {e}")
+                else:
+                    print(f"    [SKIP] {view}: {error}")
         
         # Verify deletion
         if verbose:
@@ -167,16 +251,16 @@ def delete_all_data(confirm=True, verbose=True):
             print("-" * 60)
             
             try:
-                counts = get_table_counts(cursor)
-                remaining_rows = sum(count for _, count in counts)
+                counts = get_table_counts(cursor, exact)
+                remaining_rows = sum(count for _, count, _ in counts)
                 
                 if remaining_rows == 0:
                     print("    [OK] All data successfully deleted")
                 else:
                     print(f"    [WARNING] {remaining_rows} rows still remain")
-                    for table_name, row_count in counts:
+                    for table_name, row_count, estimated in counts:
                         if row_count > 0:
-                            print(f"        {table_name}: {row_count} rows")
+                            print(f"        {table_name}: {row_count} rows{' (estimate)' if estimated else ''}")
             except Exception as e:
                 print(f"    [Could not verify: {e}]")
         
@@ -196,7 +280,7 @@ def delete_all_data(confirm=True, verbose=True):
         traceback.print_exc()
         sys.exit(1)
 
-def delete_specific_tables(tables, confirm=True, verbose=True):
+def delete_specific_tables(tables, confirm=True, verbose=True, db_config=None):
     """
     Delete data from specific tables only
     
@@ -204,16 +288,22 @@ def delete_specific_tables(tables, confirm=True, verbose=True):
         tables: List of table names to delete from
         confirm: If True, ask for user confirmation
         verbose: If True, show detailed progress
+        db_config: Connection kwargs (default: get_db_config())
     """
+    db_config = db_config or get_db_config()
+    
     print("="*80)
     print("DELETE DATA FROM SPECIFIC TABLES")
     print("="*80)
     
+    import psycopg as db
+    from psycopg import sql
+    
     try:
         conn = db.connect(**db_config)
         cursor = conn.cursor()
         
-        print(f"\n[1] Connected to database: {os.getenv('DB_NAME', 'advocacy_platform')}")
+        print(f"\n[1] Connected to database: {db_config['dbname']}")
         print(f"[2] Tables to delete: {', '.join(tables)}")
         
         if confirm:
@@ -234,13 +324,16 @@ def delete_specific_tables(tables, confirm=True, verbose=True):
         
         cursor.execute("BEGIN;")
         
-        for table in tables:
-            try:
-                cursor.execute(f"TRUNCATE TABLE {table} CASCADE;")
-                if verbose:
-                    print(f"    [OK] Truncated: {table}")
-            except Exception as e:
-                print(f"    [ERROR] {table}: {e}")
+        # One TRUNCATE for all tables: a single round trip, and the names are
+        # quoted as identifiers rather than pasted into the SQL. If any table
+        # is missing, the statement fails and nothing is deleted
+        cursor.execute(sql.SQL("TRUNCATE TABLE {} CASCADE;").format(
+            sql.SQL(", ").join(map(sql.Identifier, tables))
+        ))
+        
+        if verbose:
+            for table in tables:
+                print(f"    [OK] Truncated: {table}")
         
         conn.commit()
         cursor.close()
@@ -288,6 +381,12 @@ Examples:
         help='Reduce output verbosity'
     )
     
+    parser.add_argument(
+        '--exact',
+        action='store_true',
+        help='Report exact row counts (COUNT(*) per table) instead of estimates'
+    )
+    
     parser.add_argument(
         '--tables',
         nargs='+',
@@ -295,6 +394,7 @@ Examples:
     )
     
     args = parser.parse_args()
+    db_config = get_db_config()
     
     # Check if password is set
     if not db_config['password']:
@@ -307,11 +407,14 @@ Examples:
         delete_specific_tables(
             args.tables,
             confirm=not args.no_confirm,
-            verbose=not args.quiet
+            verbose=not args.quiet,
+            db_config=db_config
         )
     else:
         delete_all_data(
             confirm=not args.no_confirm,
-            verbose=not args.quiet
+            verbose=not args.quiet,
+            exact=args.exact,
+            db_config=db_config
         )
 
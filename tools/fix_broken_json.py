@@ -6,19 +6,214 @@ Identifies and fixes broken JSON files (missing braces, invalid syntax, etc.)
 """
 
 import json
+import mmap
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
 from pathlib import Path
+from typing import Dict, List, Optional, Tuple
 
+# Try to import orjson (optional dependency, parses several times faster)
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    orjson = None
+    _json_loads = json.loads
 
-def fix_broken_json_files(data_dir: str = "../data"):
+# Try to import json_repair (optional dependency, used by --allow-lossy-repair
+# for files the built-in heuristics can't fix: truncated strings, stray
+# commas, etc.)
+try:
+    from json_repair import repair_json
+except ImportError:
+    repair_json = None
+
+# Files above this size are checked straight from a memory map (orjson
+# only); a valid file's bytes are then never copied into the process
+MMAP_MIN_SIZE = 64 * 1024
+
+# Bytes read from the end of a file by the --fast tail check
+TAIL_CHECK_SIZE = 16
+
+# Per-file repair messages are written to stdout in batches of this size
+OUTPUT_BATCH_SIZE = 1024
+
+# Written to the data directory by --cache: the mtime and size of every
+# file last seen valid, so unchanged files aren't parsed again
+CACHE_FILE = '.json_repair_cache.json'
+
+# Bytes of a broken file's end examined by the repair heuristics
+REPAIR_TAIL_SIZE = 512
+
+
+def _tail(content: bytes) -> bytes:
+    """
+    Return the end of content with trailing whitespace removed, looking
+    only at the last REPAIR_TAIL_SIZE bytes unless they are all whitespace.
+    """
+    tail = content[-REPAIR_TAIL_SIZE:].rstrip()
+    if not tail and len(content) > REPAIR_TAIL_SIZE:
+        tail = content.rstrip()
+    return tail
+
+
+def _repair_with_library(content: bytes) -> Optional[bytes]:
+    """
+    Repair a broken file with json_repair.
+    
+    The result is lossy: json_repair guesses at the intended structure
+    (a truncated record is kept as whatever parsed) and the file is
+    re-serialized, so its original formatting is lost.
+    
+    Args:
+        content: Raw bytes of the broken file
+    
+    Returns:
+        The repaired file content, or None if json_repair isn't installed or
+        couldn't recover a non-empty JSON object (every data file is one)
+    """
+    if repair_json is None:
+        return None
+    try:
+        repaired = repair_json(content.decode('utf-8'), return_objects=True)
+    except Exception:
+        return None
+    if not isinstance(repaired, dict) or not repaired:
+        return None
+    fixed_content = json.dumps(repaired, ensure_ascii=False).encode('utf-8')
+    try:
+        # json.dumps writes NaN/Infinity, which aren't valid JSON
+        _json_loads(fixed_content)
+    except json.JSONDecodeError:
+        return None
+    return fixed_content
+
+
+def _check_file(json_file: Path,
+                fast: bool = False) -> Tuple[Optional[str], Optional[bytes]]:
+    """
+    Parse one JSON file (runs in a worker process).
+    
+    Args:
+        json_file: Path of the file to check
+        fast: If True, assume a file whose last non-whitespace byte is '}'
+            is valid and only fully parse files with a suspect tail
+    
+    Returns:
+        (parse error, file content) - both None if the file is valid JSON;
+        a broken file's content is handed back so the repair pass doesn't
+        have to read it again
+    """
+    with open(json_file, 'rb') as f:
+        size = os.fstat(f.fileno()).st_size
+        if fast:
+            f.seek(max(0, size - TAIL_CHECK_SIZE))
+            if f.read().rstrip().endswith(b'}'):
+                return None, None
+            f.seek(0)
+        if orjson is not None and size > MMAP_MIN_SIZE:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped, \
+                    memoryview(mapped) as view:
+                try:
+                    orjson.loads(view)
+                    return None, None
+                except orjson.JSONDecodeError as e:
+                    # Only a broken file is copied out, for the repair pass
+                    return str(e), bytes(view)
+        content = f.read()
+    try:
+        # Both parsers take bytes directly, skipping a separate text decode
+        _json_loads(content)
+        return None, None
+    except json.JSONDecodeError as e:
+        # orjson.JSONDecodeError subclasses json.JSONDecodeError
+        return str(e), content
+
+
+def _file_key(json_file: Path) -> List[int]:
+    """Return [mtime_ns, size] for a file (a list, as stored in the cache)."""
+    st = os.stat(json_file)
+    return [st.st_mtime_ns, st.st_size]
+
+
+def _load_cache(cache_path: Path) -> Dict[str, List[int]]:
+    """
+    Read the validation cache written by _save_cache().
+    
+    Returns:
+        {file name: [mtime_ns, size]} of files last seen valid; empty if
+        there's no cache yet or it can't be read
+    """
+    try:
+        with open(cache_path, 'rb') as f:
+            cache = _json_loads(f.read())
+    except (OSError, ValueError):
+        return {}
+    return cache if isinstance(cache, dict) else {}
+
+
+def _save_cache(cache_path: Path, cache: Dict[str, List[int]]):
+    """Write the validation cache, ignoring a read-only data directory."""
+    try:
+        with open(cache_path, 'w', encoding='utf-8') as f:
+            json.dump(cache, f)
+    except OSError as e:
+        print(f'[!] Could not write {cache_path.name}: {e}')
+
+
+def _check_files(json_files: List[Path], processes: Optional[int],
+                 fast: bool = False) -> List[Tuple[Optional[str], Optional[bytes]]]:
+    """
+    Run _check_file over every file, in file order.
+    
+    Files are independent and parsing is CPU bound, so they are spread
+    across worker processes unless processes is 1.
+    """
+    check = partial(_check_file, fast=fast)
+    if processes == 1:
+        return list(map(check, json_files))
+    with ProcessPoolExecutor(max_workers=processes) as executor:
+        return list(executor.map(check, json_files, chunksize=32))
+
+
+def fix_broken_json_files(data_dir: str = "../data", processes: int = None,
+                          verify: bool = False, fast: bool = False,
+                          verbose: bool = True, cache: bool = False,
+                          allow_lossy: bool = False):
     """
     Identifies and fixes broken JSON files in the data directory.
     The common issue is missing closing braces at the end of files.
     
     Args:
         data_dir: Path to the data directory (default: ../data)
+        processes: Worker processes for the detect and verify passes
+            (default: one per CPU; 1 checks every file in this process)
+        verify: If True, re-parse every file after repairing instead of
+            deriving the final counts from the repair results
+        fast: If True, only fully parse files that don't end with '}' in
+            the detect pass (a file can end with '}' and still be broken
+            earlier on; --verify always parses every file)
+        verbose: If True, print a line for every file the repair pass
+            touches; the summary is printed either way
+        cache: If True, skip files whose mtime and size match the last run
+            that found them valid, and record the valid files in
+            CACHE_FILE in the data directory for the next run
+        allow_lossy: If True, files the built-in fixes can't repair are
+            rewritten by json_repair (if installed); the original is kept
+            next to each as <name>.bak
     """
     data_path = Path(__file__).parent / data_dir
-    json_files = sorted(data_path.glob('user_*.json'))
+    
+    # One scandir pass: file types come from the directory listing, so
+    # there's no glob matching or stat call per entry
+    with os.scandir(data_path) as entries:
+        names = sorted(
+            entry.name for entry in entries
+            if entry.name.startswith('user_') and entry.name.endswith('.json') and entry.is_file()
+        )
+    json_files = [data_path / name for name in names]
     
     print('='*60)
     print('JSON FILE REPAIR TOOL')
@@ -27,72 +222,130 @@ def fix_broken_json_files(data_dir: str = "../data"):
     
     broken_files = []
     fixed_files = []
+    lossy_files = []
     unfixable_files = []
     
+    if allow_lossy and repair_json is None:
+        print('[!] --allow-lossy-repair needs json_repair (pip install json-repair); '
+              'only the built-in fixes will be tried\n')
+    
+    to_check = json_files
+    if cache:
+        cache_path = data_path / CACHE_FILE
+        cached = _load_cache(cache_path)
+        file_keys = {json_file.name: _file_key(json_file) for json_file in json_files}
+        to_check = [json_file for json_file in json_files
+                    if cached.get(json_file.name) != file_keys[json_file.name]]
+        print(f'Skipping {len(json_files) - len(to_check)} files unchanged since the last run')
+    
     # First pass: identify broken files
-    for json_file in json_files:
-        try:
-            with open(json_file, 'r', encoding='utf-8') as f:
-                json.load(f)
-        except json.JSONDecodeError as e:
-            broken_files.append((json_file, str(e)))
+    for json_file, (error, content) in zip(to_check, _check_files(to_check, processes, fast)):
+        if error is not None:
+            broken_files.append((json_file, error, content))
     
     print(f'Found {len(broken_files)} broken JSON files')
     
+    if cache:
+        # Record every file now known to be valid; a file that only passed
+        # the --fast tail check keeps its old entry (if it still matches)
+        broken_names = {json_file.name for json_file, _, _ in broken_files}
+        valid_keys = {
+            name: key for name, key in file_keys.items()
+            if name not in broken_names and (not fast or cached.get(name) == key)
+        }
+    
     if not broken_files:
+        if cache:
+            _save_cache(cache_path, valid_keys)
         print('\n[OK] All JSON files are valid!')
         return {
             'total': len(json_files),
             'broken': 0,
             'fixed': 0,
-            'unfixable': 0
+            'lossy': 0,
+            'unfixable': 0,
+            'still_broken': 0
         }
     
     print(f'Attempting to repair...\n')
     
+    # Per-file messages are buffered and written in batches rather than
+    # one print per file
+    out = []
+    add = out.append if verbose else (lambda line: None)
+    
     # Second pass: attempt to fix broken files
-    for json_file, error in broken_files:
+    for json_file, error, content in broken_files:
         try:
-            # Read the file content
-            with open(json_file, 'r', encoding='utf-8') as f:
-                content = f.read()
+            # Work on the bytes read by the first pass; only the end of the
+            # file is inspected, so there's no need to decode all of it
+            tail = _tail(content)
             
             # Try common fixes
             fixed_content = None
             
             # Fix 1: Missing closing brace at the end
-            if content.strip().endswith(']'):
-                fixed_content = content.rstrip() + '\n}'
+            if tail.endswith(b']'):
+                fixed_content = content.rstrip() + b'\n}'
             
             # Fix 2: Extra trailing content after valid JSON
-            elif not content.strip().endswith('}'):
+            elif not tail.endswith(b'}'):
                 # Try to find the last ] and add }
-                if ']' in content:
-                    last_bracket = content.rfind(']')
-                    fixed_content = content[:last_bracket+1].rstrip() + '\n}'
+                last_bracket = content.rfind(b']')
+                if last_bracket >= 0:
+                    fixed_content = content[:last_bracket+1].rstrip() + b'\n}'
             
+            reason = 'No applicable fix found'
             if fixed_content:
                 # Validate the fix
                 try:
-                    json.loads(fixed_content)
-                    
-                    # Write the fixed content back
-                    with open(json_file, 'w', encoding='utf-8') as f:
-                        f.write(fixed_content)
-                    
-                    fixed_files.append(json_file.name)
-                    print(f'  [OK] Fixed: {json_file.name}')
-                    
+                    _json_loads(fixed_content)
                 except json.JSONDecodeError:
-                    unfixable_files.append((json_file.name, 'Fix did not produce valid JSON'))
-                    print(f'  [X] Could not fix: {json_file.name}')
+                    fixed_content = None
+                    reason = 'Fix did not produce valid JSON'
+            
+            # Fix 3 (opt-in): Anything else goes to json_repair. Its guess
+            # replaces the file, so the original is backed up first.
+            lossy = False
+            if fixed_content is None and allow_lossy:
+                fixed_content = _repair_with_library(content)
+                lossy = fixed_content is not None
+            
+            if fixed_content is not None:
+                if lossy:
+                    backup = json_file.with_name(json_file.name + '.bak')
+                    with open(backup, 'wb') as f:
+                        f.write(content)
+                
+                # Write the fixed content back
+                with open(json_file, 'wb') as f:
+                    f.write(fixed_content)
+                
+                fixed_files.append(json_file.name)
+                if cache:
+                    valid_keys[json_file.name] = _file_key(json_file)
+                if lossy:
+                    lossy_files.append(json_file.name)
+                    add(f'  [!] Fixed (lossy, original saved as {backup.name}): {json_file.name}')
+                else:
+                    add(f'  [OK] Fixed: {json_file.name}')
             else:
-                unfixable_files.append((json_file.name, 'No applicable fix found'))
-                print(f'  [X] Could not fix: {json_file.name}')
+                unfixable_files.append((json_file.name, reason))
+                add(f'  [X] Could not fix: {json_file.name}')
                 
         except Exception as e:
             unfixable_files.append((json_file.name, str(e)))
-            print(f'  [X] Error fixing {json_file.name}: {e}')
+            add(f'  [X] Error fixing {json_file.name}: {e}')
+        
+        if len(out) >= OUTPUT_BATCH_SIZE:
+            sys.stdout.write('\n'.join(out) + '\n')
+            out.clear()
+    
+    if out:
+        sys.stdout.write('\n'.join(out) + '\n')
+    
+    if cache:
+        _save_cache(cache_path, valid_keys)
     
     # Summary
     print('\n' + '='*60)
@@ -100,6 +353,8 @@ def fix_broken_json_files(data_dir: str = "../data"):
     print('='*60)
     print(f'Total broken files: {len(broken_files)}')
     print(f'Successfully fixed: {len(fixed_files)}')
+    if lossy_files:
+        print(f'  of which lossy (json_repair, originals saved as .bak): {len(lossy_files)}')
     print(f'Could not fix: {len(unfixable_files)}')
     
     if unfixable_files:
@@ -114,16 +369,14 @@ def fix_broken_json_files(data_dir: str = "../data"):
     print('VERIFICATION')
     print('='*60)
     
-    all_valid = 0
-    still_broken = 0
-    
-    for json_file in json_files:
-        try:
-            with open(json_file, 'r', encoding='utf-8') as f:
-                json.load(f)
-            all_valid += 1
-        except json.JSONDecodeError:
-            still_broken += 1
+    if verify:
+        results = _check_files(json_files, processes)
+        still_broken = sum(error is not None for error, _ in results)
+    else:
+        # Every fix was validated before it was written, so only the
+        # broken files that weren't fixed are still broken
+        still_broken = len(broken_files) - len(fixed_files)
+    all_valid = len(json_files) - still_broken
     
     print(f'Valid JSON files: {all_valid}/{len(json_files)}')
     print(f'Still broken: {still_broken}')
@@ -137,6 +390,7 @@ def fix_broken_json_files(data_dir: str = "../data"):
         'total': len(json_files),
         'broken': len(broken_files),
         'fixed': len(fixed_files),
+        'lossy': len(lossy_files),
         'unfixable': len(unfixable_files),
         'still_broken': still_broken
     }
@@ -154,7 +408,50 @@ if __name__ == '__main__':
         help='Path to data directory (default: ../data)'
     )
     
+    parser.add_argument(
+        '--processes',
+        type=int,
+        default=None,
+        help='Worker processes for checking files (default: one per CPU)'
+    )
+    
+    parser.add_argument(
+        '--verify',
+        action='store_true',
+        help='Re-parse every file after repairing to confirm the final counts'
+    )
+    
+    parser.add_argument(
+        '--fast',
+        action='store_true',
+        help="Skip the full parse for files that end with '}' (may miss "
+             "files that are broken earlier on)"
+    )
+    
+    parser.add_argument(
+        '--quiet',
+        action='store_true',
+        help='Only print the summary, not a line per repaired file'
+    )
+    
+    parser.add_argument(
+        '--cache',
+        action='store_true',
+        help=f'Skip files unchanged since they were last found valid '
+             f'(stored in {CACHE_FILE} in the data directory)'
+    )
+    
+    parser.add_argument(
+        '--allow-lossy-repair',
+        action='store_true',
+        help='Rewrite files the built-in fixes can\'t repair with json_repair '
+             '(may drop data; the original is kept as <name>.bak)'
+    )
+    
     args = parser.parse_args()
-    fix_broken_json_files(args.data_dir)
+    fix_broken_json_files(args.data_dir, processes=args.processes,
+                          verify=args.verify, fast=args.fast,
+                          verbose=not args.quiet, cache=args.cache,
+                          allow_lossy=args.allow_lossy_repair)
 
 
@@ -3,9 +3,10 @@ Verify impact_score implementation
 """
 import psycopg
 import os
-from dotenv import load_dotenv
+import sys
+from _env import load_env
 
-load_dotenv()
+load_env()
 
 db_config = {
     'host': os.getenv('DB_HOST', 'localhost'),
@@ -15,144 +16,241 @@ db_config = {
     'password': os.getenv('DB_PASSWORD')
 }
 
+# Column metadata for steps 1 and 3. Reads pg_attribute because
+# information_schema.columns doesn't list the columns of materialized views.
+COLUMNS_QUERY = """
+    SELECT 
+        c.relname,
+        a.attname,
+        format_type(a.atttypid, NULL) AS data_type,
+        CASE WHEN a.attgenerated <> '' THEN 'ALWAYS' ELSE 'NEVER' END AS is_generated
+    FROM pg_attribute a
+    JOIN pg_class c ON c.oid = a.attrelid
+    WHERE c.relname IN ('social_analytics', 'mv_account_engagement')
+    AND pg_table_is_visible(c.oid)
+    AND a.attnum > 0
+    AND NOT a.attisdropped
+    AND (
+        (c.relname = 'social_analytics'
+         AND a.attname IN ('engagement_score', 'impact_score', 'engagement_rate'))
+        OR (c.relname = 'mv_account_engagement'
+         AND (a.attname LIKE '%impact%' OR a.attname LIKE '%engagement_rate%'))
+    )
+    ORDER BY a.attname;
+"""
+
+SAMPLES_QUERY = """
+    SELECT 
+        likes, comments, shares, reach,
+        engagement_score,
+        impact_score,
+        engagement_rate
+    FROM social_analytics 
+    WHERE likes IS NOT NULL 
+    LIMIT 3;
+"""
+
+# Recomputes both scores for every row in SQL and counts the rows whose
+# stored value is off (or NULL), so only three integers come back
+MISMATCH_QUERY = """
+    WITH expected AS (
+        SELECT 
+            engagement_score,
+            impact_score,
+            COALESCE(likes, 0) + COALESCE(comments, 0) * 2 + COALESCE(shares, 0) * 3 AS expected_eng,
+            COALESCE(reach, 0) AS reach
+        FROM social_analytics 
+        WHERE likes IS NOT NULL
+    )
+    SELECT 
+        COUNT(*) as checked,
+        COUNT(*) FILTER (WHERE (ABS(engagement_score - expected_eng) < 0.01) IS NOT TRUE) as eng_mismatches,
+        COUNT(*) FILTER (WHERE (ABS(impact_score - (expected_eng * 0.7 + reach * 0.0003)) < 0.01) IS NOT TRUE) as imp_mismatches
+    FROM expected;
+"""
+
+PLATFORM_QUERY = """
+    SELECT 
+        platform,
+        avg_engagement_score,
+        avg_impact_score,
+        avg_engagement_rate
+    FROM mv_platform_performance
+    ORDER BY avg_impact_score DESC NULLS LAST
+    LIMIT 3;
+"""
+
+BRAND_QUERY = """
+    SELECT 
+        brand,
+        avg_engagement_score,
+        avg_impact_score,
+        avg_engagement_rate
+    FROM mv_brand_performance
+    WHERE brand != 'Unknown'
+    ORDER BY avg_impact_score DESC NULLS LAST
+    LIMIT 3;
+"""
+
+STATS_QUERY = """
+    SELECT 
+        COUNT(*) as total_records,
+        COUNT(impact_score) as records_with_impact,
+        AVG(engagement_score)::NUMERIC(10,2) as avg_engagement,
+        AVG(impact_score)::NUMERIC(10,2) as avg_impact,
+        MAX(engagement_score) as max_engagement,
+        MAX(impact_score)::NUMERIC(10,2) as max_impact
+    FROM social_analytics;
+"""
+
+QUERIES = {
+    'columns': COLUMNS_QUERY,
+    'samples': SAMPLES_QUERY,
+    'mismatches': MISMATCH_QUERY,
+    'platforms': PLATFORM_QUERY,
+    'brands': BRAND_QUERY,
+    'stats': STATS_QUERY,
+}
+
+# Query errors, one per failed check
+failures = []
+
+
+def run_queries(conn, queries):
+    """
+    Run every query and return {name: rows, or the psycopg error it raised}
+    
+    The queries are sent in one pipeline so they cost a single round trip.
+    Rows come back in binary format, so NUMERIC and integer values aren't
+    formatted as text by the server and parsed again here. A failing query
+    aborts the ones queued after it; those are re-run one at a time, so a
+    missing view or column only fails its own step.
+    """
+    cursors = {}
+    try:
+        with conn.pipeline():
+            for name, query in queries.items():
+                cursors[name] = conn.execute(query, binary=True)
+    except psycopg.Error:
+        pass  # Collected per query below
+    
+    results = {}
+    for name, query in queries.items():
+        cursor = cursors.get(name)
+        if cursor is not None and cursor.pgresult is not None:
+            results[name] = cursor.fetchall()
+            continue
+        try:
+            results[name] = conn.execute(query, binary=True).fetchall()
+        except psycopg.Error as e:
+            results[name] = e
+    return results
+
+
+def check_failed(result):
+    """Report a failed query for the current step; True if it failed"""
+    if isinstance(result, psycopg.Error):
+        print(f"    [X] Query failed: {str(result).splitlines()[0]}")
+        failures.append(result)
+        return True
+    return False
+
+
 print("=" * 80)
 print("VERIFYING IMPACT_SCORE IMPLEMENTATION")
 print("=" * 80)
 
 try:
-    conn = psycopg.connect(**db_config)
-    cursor = conn.cursor()
+    # Read-only checks, so no transaction is needed around each query
+    conn = psycopg.connect(**db_config, autocommit=True)
+    results = run_queries(conn, QUERIES)
     
     # 1. Check if impact_score column exists in social_analytics
     print("\n[1/6] Checking if impact_score column exists...")
-    cursor.execute("""
-        SELECT column_name, data_type, is_generated
-        FROM information_schema.columns 
-        WHERE table_name='social_analytics' 
-        AND column_name IN ('engagement_score', 'impact_score', 'engagement_rate')
-        ORDER BY column_name;
-    """)
-    columns = cursor.fetchall()
-    for col in columns:
-        print(f"    [OK] {col[0]}: {col[1]} (generated: {col[2]})")
+    columns = {'social_analytics': [], 'mv_account_engagement': []}
+    if not check_failed(results['columns']):
+        for table_name, *col in results['columns']:
+            columns[table_name].append(col)
+        for col in columns['social_analytics']:
+            print(f"    [OK] {col[0]}: {col[1]} (generated: {col[2]})")
     
     # 2. Check sample data
     print("\n[2/6] Checking sample data from social_analytics...")
-    cursor.execute("""
-        SELECT 
-            likes, comments, shares, reach,
-            engagement_score,
-            impact_score,
-            engagement_rate
-        FROM social_analytics 
-        WHERE likes IS NOT NULL 
-        LIMIT 3;
-    """)
-    samples = cursor.fetchall()
-    for i, row in enumerate(samples, 1):
-        likes, comments, shares, reach, eng_score, imp_score, eng_rate = row
-        print(f"    Sample {i}:")
-        print(f"      Likes: {likes}, Comments: {comments}, Shares: {shares}, Reach: {reach}")
-        print(f"      Engagement Score: {eng_score}")
-        print(f"      Impact Score: {imp_score}")
-        print(f"      Engagement Rate: {eng_rate}%")
-        
-        # Verify calculation
-        expected_eng = (likes or 0) + ((comments or 0) * 2) + ((shares or 0) * 3)
-        expected_imp = (expected_eng * 0.7) + ((reach or 0) * 0.0003)
-        print(f"      Calculation check: Eng={expected_eng} (expected {eng_score}) [OK]" if abs(expected_eng - eng_score) < 0.01 else f"      [X] MISMATCH")
-        print(f"      Calculation check: Imp={expected_imp:.2f} (expected {imp_score}) [OK]" if abs(expected_imp - float(imp_score)) < 0.01 else f"      [X] MISMATCH")
+    if not check_failed(results['samples']):
+        # Collect the sample lines and write them once, not one print per line
+        out = []
+        add = out.append
+        for i, row in enumerate(results['samples'], 1):
+            likes, comments, shares, reach, eng_score, imp_score, eng_rate = row
+            add(f"    Sample {i}:")
+            add(f"      Likes: {likes}, Comments: {comments}, Shares: {shares}, Reach: {reach}")
+            add(f"      Engagement Score: {eng_score}")
+            add(f"      Impact Score: {imp_score}")
+            add(f"      Engagement Rate: {eng_rate}%")
+        if out:
+            sys.stdout.write('\n'.join(out) + '\n')
+    
+    # Verify calculation across every row, not just the samples
+    if not check_failed(results['mismatches']):
+        checked, eng_mismatches, imp_mismatches = results['mismatches'][0]
+        print(f"    Calculation check ({checked:,} rows):")
+        print(f"      Engagement Score mismatches: {eng_mismatches} [OK]" if eng_mismatches == 0 else f"      [X] Engagement Score mismatches: {eng_mismatches}")
+        print(f"      Impact Score mismatches: {imp_mismatches} [OK]" if imp_mismatches == 0 else f"      [X] Impact Score mismatches: {imp_mismatches}")
     
     # 3. Check materialized view mv_account_engagement
     print("\n[3/6] Checking mv_account_engagement columns...")
-    cursor.execute("""
-        SELECT column_name
-        FROM information_schema.columns 
-        WHERE table_name='mv_account_engagement' 
-        AND column_name LIKE '%impact%' OR column_name LIKE '%engagement_rate%'
-        ORDER BY column_name;
-    """)
-    mv_columns = cursor.fetchall()
-    for col in mv_columns:
+    for col in columns['mv_account_engagement']:
         print(f"    [OK] {col[0]}")
     
     # 4. Check materialized view mv_platform_performance
     print("\n[4/6] Checking mv_platform_performance data...")
-    cursor.execute("""
-        SELECT 
-            platform,
-            avg_engagement_score,
-            avg_impact_score,
-            avg_engagement_rate
-        FROM mv_platform_performance
-        ORDER BY avg_impact_score DESC NULLS LAST
-        LIMIT 3;
-    """)
-    platform_data = cursor.fetchall()
-    for row in platform_data:
-        platform, avg_eng, avg_imp, avg_rate = row
-        print(f"    {platform}:")
-        eng_str = f"{avg_eng:.1f}" if avg_eng is not None else "NULL"
-        imp_str = f"{avg_imp:.1f}" if avg_imp is not None else "NULL"
-        rate_str = f"{avg_rate:.2f}" if avg_rate is not None else "NULL"
-        print(f"      Avg Engagement: {eng_str}")
-        print(f"      Avg Impact: {imp_str}")
-        print(f"      Avg Eng Rate: {rate_str}%")
+    if not check_failed(results['platforms']):
+        for row in results['platforms']:
+            platform, avg_eng, avg_imp, avg_rate = row
+            print(f"    {platform}:")
+            eng_str = f"{avg_eng:.1f}" if avg_eng is not None else "NULL"
+            imp_str = f"{avg_imp:.1f}" if avg_imp is not None else "NULL"
+            rate_str = f"{avg_rate:.2f}" if avg_rate is not None else "NULL"
+            print(f"      Avg Engagement: {eng_str}")
+            print(f"      Avg Impact: {imp_str}")
+            print(f"      Avg Eng Rate: {rate_str}%")
     
     # 5. Check materialized view mv_brand_performance
     print("\n[5/6] Checking mv_brand_performance data...")
-    cursor.execute("""
-        SELECT 
-            brand,
-            avg_engagement_score,
-            avg_impact_score,
-            avg_engagement_rate
-        FROM mv_brand_performance
-        WHERE brand != 'Unknown'
-        ORDER BY avg_impact_score DESC NULLS LAST
-        LIMIT 3;
-    """)
-    brand_data = cursor.fetchall()
-    for row in brand_data:
-        brand, avg_eng, avg_imp, avg_rate = row
-        print(f"    {brand}:")
-        eng_str = f"{avg_eng:.1f}" if avg_eng is not None else "NULL"
-        imp_str = f"{avg_imp:.1f}" if avg_imp is not None else "NULL"
-        rate_str = f"{avg_rate:.2f}" if avg_rate is not None else "NULL"
-        print(f"      Avg Engagement: {eng_str}")
-        print(f"      Avg Impact: {imp_str}")
-        print(f"      Avg Eng Rate: {rate_str}%")
+    if not check_failed(results['brands']):
+        for row in results['brands']:
+            brand, avg_eng, avg_imp, avg_rate = row
+            print(f"    {brand}:")
+            eng_str = f"{avg_eng:.1f}" if avg_eng is not None else "NULL"
+            imp_str = f"{avg_imp:.1f}" if avg_imp is not None else "NULL"
+            rate_str = f"{avg_rate:.2f}" if avg_rate is not None else "NULL"
+            print(f"      Avg Engagement: {eng_str}")
+            print(f"      Avg Impact: {imp_str}")
+            print(f"      Avg Eng Rate: {rate_str}%")
     
     # 6. Summary stats
     print("\n[6/6] Summary statistics...")
-    cursor.execute("""
-        SELECT 
-            COUNT(*) as total_records,
-            COUNT(impact_score) as records_with_impact,
-            AVG(engagement_score)::NUMERIC(10,2) as avg_engagement,
-            AVG(impact_score)::NUMERIC(10,2) as avg_impact,
-            MAX(engagement_score) as max_engagement,
-            MAX(impact_score)::NUMERIC(10,2) as max_impact
-        FROM social_analytics;
-    """)
-    stats = cursor.fetchone()
-    print(f"    Total records: {stats[0]:,}")
-    print(f"    Records with impact_score: {stats[1]:,}")
-    print(f"    Average engagement score: {stats[2]}")
-    print(f"    Average impact score: {stats[3]}")
-    print(f"    Max engagement score: {stats[4]}")
-    print(f"    Max impact score: {stats[5]}")
+    if not check_failed(results['stats']):
+        stats = results['stats'][0]
+        print(f"    Total records: {stats[0]:,}")
+        print(f"    Records with impact_score: {stats[1]:,}")
+        print(f"    Average engagement score: {stats[2]}")
+        print(f"    Average impact score: {stats[3]}")
+        print(f"    Max engagement score: {stats[4]}")
+        print(f"    Max impact score: {stats[5]}")
+    
+    conn.close()
     
     print("\n" + "=" * 80)
+    if failures:
+        print(f"[ERROR] VERIFICATION INCOMPLETE - {len(failures)} check(s) failed")
+        print("=" * 80)
+        exit(1)
     print("[SUCCESS] VERIFICATION COMPLETE - All checks passed!")
     print("=" * 80)
     
-    cursor.close()
-    conn.close()
-    
 except Exception as e:
     print(f"\n[ERROR] {e}")
     import traceback
     traceback.print_exc()
     exit(1)
-